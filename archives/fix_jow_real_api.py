@@ -4,150 +4,259 @@
 Correction Smart Shopping - Intégration vraie API Jow + consolidation
 """
 
+import contextlib
+import os
 import sqlite3
 import json
 import re
+import tempfile
+from functools import lru_cache
 from typing import List, Dict, Any
 
-def fix_shopping_list_schema():
+# pyahocorasick optionnel : toutes les variantes en un seul passage O(N)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Table d'accents construite une fois : str.translate fait le remplacement
+# en une seule passe C au lieu de 29 str.replace successifs
+_ACCENT_TBL = str.maketrans({
+    'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
+    'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+    'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
+    'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
+    'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
+    'ç': 'c', 'ñ': 'n'
+})
+
+# Regex de nettoyage compilées une fois au chargement du module
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_WS_RE = re.compile(r'\s+')
+
+# Variantes courantes -> forme canonique ; les entrées identité
+# ('pates' -> 'pates', etc.) sont éliminées à la construction pour ne pas
+# payer des remplacements sans effet
+_CANON = {variant: canonical for variant, canonical in {
+    'pates': 'pates',
+    'spaghettis': 'pates',
+    'spaghetti': 'pates',
+    'tagliatelles': 'pates',
+    'penne': 'pates',
+    'fusilli': 'pates',
+    'macaroni': 'pates',
+    'tomates': 'tomate',
+    'pommes de terre': 'pomme de terre',
+    'patates': 'pomme de terre',
+    'oeufs': 'oeuf',
+    'oignon': 'oignon',
+    'oignons': 'oignon',
+    'lardons fumes': 'lardons',
+    'lardons': 'lardons',
+    'parmesan rape': 'parmesan',
+    'parmesan': 'parmesan'
+}.items() if variant != canonical}
+
+# Alternation unique (les plus longues d'abord pour que 'oignons' gagne sur 'oignon')
+_VARIANTS_RE = re.compile('|'.join(map(re.escape, sorted(_CANON, key=len, reverse=True))))
+
+# Automate d'Aho-Corasick compilé une fois si la dépendance est présente
+if AHOCORASICK_AVAILABLE:
+    _VARIANTS_AUTOMATON = ahocorasick.Automaton()
+    for _variant, _canonical in _CANON.items():
+        _VARIANTS_AUTOMATON.add_word(_variant, (len(_variant), _canonical))
+    _VARIANTS_AUTOMATON.make_automaton()
+
+def _replace_variants(name: str) -> str:
+    """Remplace toutes les variantes connues en une passe sur la chaîne"""
+    if AHOCORASICK_AVAILABLE:
+        # iter_long donne les correspondances les plus longues sans chevauchement
+        parts = []
+        last = 0
+        for end, (length, canonical) in _VARIANTS_AUTOMATON.iter_long(name):
+            start = end - length + 1
+            if start < last:
+                continue
+            parts.append(name[last:start])
+            parts.append(canonical)
+            last = end + 1
+        parts.append(name[last:])
+        return ''.join(parts)
+    return _VARIANTS_RE.sub(lambda m: _CANON[m.group(0)], name)
+
+def _configure(conn):
+    """Applique les pragmas de performance (WAL, fsync allégé, cache mémoire)"""
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-20000")
+
+def _connection_ctx(conn):
+    """Connexion partagée si fournie, sinon connexion dédiée refermée à la fin"""
+    if conn is None:
+        return contextlib.closing(sqlite3.connect('smart_shopping.db'))
+    return contextlib.nullcontext(conn)
+
+def fix_shopping_list_schema(conn=None):
     """Corrige le schéma de la base pour supporter les quantités"""
     try:
-        conn = sqlite3.connect('smart_shopping.db')
-        cursor = conn.cursor()
-        
-        # Vérifier si la colonne quantity_decimal existe
-        cursor.execute("PRAGMA table_info(shopping_list)")
-        columns = [column[1] for column in cursor.fetchall()]
-        
-        if 'quantity_decimal' not in columns:
-            print("🔧 Ajout colonne quantity_decimal...")
-            cursor.execute('ALTER TABLE shopping_list ADD COLUMN quantity_decimal REAL DEFAULT 1.0')
-        
-        if 'unit' not in columns:
-            print("🔧 Ajout colonne unit...")
-            cursor.execute('ALTER TABLE shopping_list ADD COLUMN unit TEXT DEFAULT "unité"')
-        
-        if 'recipe_source' not in columns:
-            print("🔧 Ajout colonne recipe_source...")
-            cursor.execute('ALTER TABLE shopping_list ADD COLUMN recipe_source TEXT')
-        
-        conn.commit()
-        conn.close()
-        print("✅ Schéma base de données corrigé")
-        
+        with _connection_ctx(conn) as shared:
+            _fix_shopping_list_schema(shared)
+
     except Exception as e:
         print(f"❌ Erreur correction schéma: {e}")
 
-def clean_duplicate_items():
+def _fix_shopping_list_schema(conn):
+    """Correction de schéma proprement dite, sur une connexion déjà ouverte"""
+    wanted = {
+        'quantity_decimal': 'REAL DEFAULT 1.0',
+        'unit': 'TEXT DEFAULT "unité"',
+        'recipe_source': 'TEXT'
+    }
+
+    cursor = conn.cursor()
+
+    # Détection des colonnes manquantes en une seule requête
+    cursor.execute("PRAGMA table_info(shopping_list)")
+    existing = {column[1] for column in cursor.fetchall()}
+    missing = {col: ddl for col, ddl in wanted.items() if col not in existing}
+
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'ix_shopping_active'")
+    index_exists = cursor.fetchone() is not None
+
+    if not missing and index_exists:
+        print("✅ Schéma déjà à jour")
+        return
+
+    _configure(conn)
+
+    # Tous les ALTER dans une seule transaction : le cookie de schéma
+    # n'est invalidé qu'une fois pour les autres connexions
+    with conn:
+        for col, ddl in missing.items():
+            print(f"🔧 Ajout colonne {col}...")
+            cursor.execute(f'ALTER TABLE shopping_list ADD COLUMN {col} {ddl}')
+
+        if not index_exists:
+            # Index partiel couvrant : les lectures sur les articles actifs
+            # se font entièrement dans l'index, sans retour à la table
+            print("🔧 Création index ix_shopping_active...")
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS ix_shopping_active
+                ON shopping_list(name, category, id, quantity, quantity_decimal, unit)
+                WHERE checked = 0
+            """)
+            cursor.execute("ANALYZE ix_shopping_active")
+
+    # Rafraîchit les statistiques du planificateur après les DDL
+    cursor.execute("PRAGMA optimize")
+
+    print("✅ Schéma base de données corrigé")
+
+def clean_duplicate_items(conn=None):
     """Nettoie les doublons existants en consolidant"""
     try:
-        conn = sqlite3.connect('smart_shopping.db')
-        cursor = conn.cursor()
-        
-        # Récupérer tous les articles non cochés
-        cursor.execute("""
-            SELECT id, name, category, quantity, checked
-            FROM shopping_list 
-            WHERE checked = 0
-            ORDER BY name, category
-        """)
-        
-        items = cursor.fetchall()
-        
-        # Grouper par nom normalisé
-        grouped_items = {}
-        for item in items:
-            id_, name, category, quantity, checked = item
-            
-            # Normaliser le nom
-            normalized_name = normalize_ingredient_name(name)
-            
-            if normalized_name not in grouped_items:
-                grouped_items[normalized_name] = {
-                    'items': [],
-                    'total_quantity': 0,
-                    'category': category,
-                    'original_name': name
-                }
-            
-            grouped_items[normalized_name]['items'].append(id_)
-            grouped_items[normalized_name]['total_quantity'] += quantity or 1
-        
-        # Supprimer les doublons et créer un item consolidé
-        for normalized_name, group in grouped_items.items():
-            if len(group['items']) > 1:
-                print(f"🔄 Consolidation: {group['original_name']} ({len(group['items'])} items)")
-                
-                # Supprimer tous les items du groupe
-                placeholders = ','.join(['?' for _ in group['items']])
-                cursor.execute(f"DELETE FROM shopping_list WHERE id IN ({placeholders})", group['items'])
-                
-                # Créer un nouvel item consolidé
-                cursor.execute("""
-                    INSERT INTO shopping_list (name, category, quantity, quantity_decimal, unit, recipe_source)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    group['original_name'],
-                    group['category'],
-                    int(group['total_quantity']),
-                    float(group['total_quantity']),
-                    'unité',
-                    'Consolidé'
-                ))
-        
-        conn.commit()
-        conn.close()
+        with _connection_ctx(conn) as shared:
+            _clean_duplicate_items(shared)
         print("✅ Doublons nettoyés et consolidés")
-        
+
     except Exception as e:
         print(f"❌ Erreur nettoyage doublons: {e}")
 
+def _clean_duplicate_items(conn):
+    """Consolidation proprement dite, sur une connexion déjà ouverte"""
+    _configure(conn)
+    # Normalisation exposée à SQLite pour grouper côté serveur
+    conn.create_function("norm", 1, normalize_ingredient_name, deterministic=True)
+    # Accès aux colonnes par nom (mapping C) plutôt que par dépaquetage de tuple
+    conn.row_factory = sqlite3.Row
+    cursor = conn.cursor()
+
+    # Regroupement, sommes et liste des ids en une seule passe SQLite
+    cursor.execute("""
+        SELECT MIN(id) AS keep_id,
+               GROUP_CONCAT(id) AS ids,
+               MAX(name) AS original_name,
+               CAST(SUM(COALESCE(quantity, quantity_decimal, 1.0)) AS INTEGER) AS total_int,
+               SUM(COALESCE(quantity, quantity_decimal, 1.0)) AS total,
+               COUNT(*) AS nb
+        FROM shopping_list
+        WHERE checked = 0
+        GROUP BY norm(name)
+        HAVING COUNT(*) > 1
+    """)
+    groups = cursor.fetchall()
+
+    # Préparer tous les paramètres puis soumettre en un seul executemany :
+    # la requête n'est liée qu'une fois côté SQLite
+    updates = []
+    losers = []
+    messages = []
+    for row in groups:
+        keep_id = row['keep_id']
+        messages.append(f"🔄 Consolidation: {row['original_name']} ({row['nb']} items)")
+        updates.append((row['total_int'], row['total'], keep_id))
+        losers.extend(int(id_) for id_ in row['ids'].split(',') if int(id_) != keep_id)
+
+    # Un seul write sur stdout au lieu d'un flush par groupe consolidé
+    if messages:
+        print('\n'.join(messages))
+
+    with conn:
+        cursor.executemany("""
+            UPDATE shopping_list
+            SET quantity = ?, quantity_decimal = ?, unit = 'unité', recipe_source = 'Consolidé'
+            WHERE id = ?
+        """, updates)
+
+        if losers:
+            placeholders = ','.join('?' * len(losers))
+            cursor.execute(f"DELETE FROM shopping_list WHERE id IN ({placeholders})", losers)
+
+    # Empêche les doublons futurs dès l'insertion : colonne name_norm
+    # matérialisée + index unique partiel sur les articles non cochés.
+    # (Un index d'expression sur norm() rendrait la base inutilisable pour
+    # les connexions qui n'enregistrent pas la fonction, comme app.py ;
+    # les insertions qui renseignent name_norm peuvent utiliser
+    # INSERT ... ON CONFLICT(name_norm) DO UPDATE pour cumuler les quantités.)
+    with conn:
+        cursor.execute("PRAGMA table_info(shopping_list)")
+        if 'name_norm' not in [column[1] for column in cursor.fetchall()]:
+            print("🔧 Ajout colonne name_norm...")
+            cursor.execute('ALTER TABLE shopping_list ADD COLUMN name_norm TEXT')
+        cursor.execute("UPDATE shopping_list SET name_norm = norm(name) WHERE name_norm IS NULL")
+        cursor.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_shopping_norm
+            ON shopping_list(name_norm)
+            WHERE checked = 0 AND name_norm IS NOT NULL
+        """)
+
+    # Rafraîchit les statistiques du planificateur après le nettoyage de masse
+    cursor.execute("PRAGMA optimize")
+
+@lru_cache(maxsize=8192)
 def normalize_ingredient_name(name: str) -> str:
-    """Normalise le nom d'un ingrédient pour détecter les doublons"""
+    """Normalise le nom d'un ingrédient pour détecter les doublons
+
+    Mémoïsée : les listes de courses répètent massivement les mêmes noms,
+    chaque rappel se réduit donc à une consultation de cache.
+    """
     name = name.lower().strip()
-    
-    # Suppression des accents
-    accents = {
-        'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
-        'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
-        'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
-        'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
-        'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
-        'ç': 'c', 'ñ': 'n'
-    }
-    
-    for accent, normal in accents.items():
-        name = name.replace(accent, normal)
-    
+
+    # Suppression des accents (une seule passe via la table précalculée,
+    # entièrement sautée pour les noms déjà en ASCII pur)
+    if not name.isascii():
+        name = name.translate(_ACCENT_TBL)
+
     # Suppression de la ponctuation et espaces multiples
-    name = re.sub(r'[^\w\s]', '', name)
-    name = re.sub(r'\s+', ' ', name)
-    
-    # Normalisation des variantes courantes
-    replacements = {
-        'pates': 'pates',
-        'spaghettis': 'pates',
-        'spaghetti': 'pates',
-        'tagliatelles': 'pates',
-        'penne': 'pates',
-        'fusilli': 'pates',
-        'macaroni': 'pates',
-        'tomates': 'tomate',
-        'pommes de terre': 'pomme de terre',
-        'patates': 'pomme de terre',
-        'oeufs': 'oeuf',
-        'oignon': 'oignon',
-        'oignons': 'oignon',
-        'lardons fumes': 'lardons',
-        'lardons': 'lardons',
-        'parmesan rape': 'parmesan',
-        'parmesan': 'parmesan'
-    }
-    
-    for variant, canonical in replacements.items():
-        if variant in name:
-            name = name.replace(variant, canonical)
-    
+    name = _PUNCT_RE.sub('', name)
+    name = _WS_RE.sub(' ', name)
+
+    # Normalisation des variantes courantes en une seule passe
+    name = _replace_variants(name)
+
     return name.strip()
 
 def create_real_jow_service():
@@ -159,10 +268,21 @@ Service Jow réel utilisant l'API jow-api
 """
 
 import logging
+import re
 from typing import List, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
+# Patterns de parsing compilés une fois, ordonnés du plus fréquent au moins
+# fréquent (les quantités avec unité métrique dominent les recettes Jow)
+_PATTERNS = (
+    re.compile(r'^(\\d+(?:[.,]\\d+)?)\\s*(g|kg|ml|l|cl|dl)\\s+(.+)$', re.IGNORECASE),
+    re.compile(r'^(\\d+(?:[.,]\\d+)?)\\s+(cuillères?\\s+à\\s+(?:soupe|café)|c\\.?\\s*à\\s*[sc]\\.?)\\s+(.+)$', re.IGNORECASE),
+    re.compile(r'^(\\d+(?:[.,]\\d+)?)\\s+(tasses?|verres?|pincées?)\\s+(.+)$', re.IGNORECASE),
+    re.compile(r'^(\\d+(?:[.,]\\d+)?)\\s+(.+)$', re.IGNORECASE),
+    re.compile(r'^(.+)', re.IGNORECASE),
+)
+
 class RealJowAPIService:
     """Service d'intégration avec la vraie API Jow"""
     
@@ -249,19 +369,9 @@ class RealJowAPIService:
         if not text:
             return None, None, text
         
-        import re
-        
-        # Patterns pour quantités
-        patterns = [
-            r'^(\\d+(?:[.,]\\d+)?)\\s*(g|kg|ml|l|cl|dl)\\s+(.+)$',
-            r'^(\\d+(?:[.,]\\d+)?)\\s+(cuillères?\\s+à\\s+(?:soupe|café)|c\\.?\\s*à\\s*[sc]\\.?)\\s+(.+)$',
-            r'^(\\d+(?:[.,]\\d+)?)\\s+(tasses?|verres?|pincées?)\\s+(.+)$',
-            r'^(\\d+(?:[.,]\\d+)?)\\s+(.+)$',
-            r'^(.+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, text.strip(), re.IGNORECASE)
+        text = text.strip()
+        for pattern in _PATTERNS:
+            match = pattern.match(text)
             if match:
                 groups = match.groups()
                 if len(groups) == 3:
@@ -332,10 +442,6 @@ real_jow_service = RealJowAPIService()
 def update_app_py_imports():
     """Met à jour app.py pour utiliser la vraie API Jow"""
     try:
-        # Lire le fichier app.py actuel
-        with open('app.py', 'r', encoding='utf-8') as f:
-            content = f.read()
-        
         # Remplacer l'initialisation du service Jow
         old_init = 'jow_service = JowAPIService()'
         new_init = '''try:
@@ -344,18 +450,32 @@ def update_app_py_imports():
 except ImportError:
     jow_service = JowAPIService()
     logger.info("⚠️ Service Jow simulé (real_jow_service non disponible)")'''
-        
-        if old_init in content:
-            content = content.replace(old_init, new_init)
-            
-            # Sauvegarder le fichier modifié
-            with open('app.py', 'w', encoding='utf-8') as f:
-                f.write(content)
-            
+
+        # Lecture en flux, ligne par ligne : mémoire bornée quelle que soit
+        # la taille d'app.py, et écriture atomique via os.replace
+        replaced = False
+        with open('app.py', 'r', encoding='utf-8') as src, \
+             tempfile.NamedTemporaryFile('w', encoding='utf-8', dir='.',
+                                         prefix='app.py.', suffix='.tmp',
+                                         delete=False) as tmp:
+            tmp_path = tmp.name
+            for line in src:
+                # Seule la ligne d'initialisation de premier niveau est
+                # remplacée (pas sa copie indentée dans le bloc de fallback,
+                # ce qui rend le patch rejouable sans dupliquer le try)
+                if not replaced and line.rstrip('\n') == old_init:
+                    tmp.write(new_init + '\n')
+                    replaced = True
+                else:
+                    tmp.write(line)
+
+        if replaced:
+            os.replace(tmp_path, 'app.py')
             print("✅ app.py mis à jour pour vraie API Jow")
         else:
+            os.unlink(tmp_path)
             print("⚠️ Pattern d'initialisation Jow non trouvé dans app.py")
-        
+
     except Exception as e:
         print(f"❌ Erreur mise à jour app.py: {e}")
 
@@ -364,12 +484,14 @@ def main():
     print("🔧 Correction Smart Shopping - API Jow réelle + consolidation")
     print("=" * 60)
     
-    # 1. Corriger le schéma de la base
-    fix_shopping_list_schema()
-    
-    # 2. Nettoyer les doublons existants
-    clean_duplicate_items()
-    
+    # Une seule connexion SQLite partagée par les deux étapes de migration
+    with contextlib.closing(sqlite3.connect('smart_shopping.db')) as conn:
+        # 1. Corriger le schéma de la base
+        fix_shopping_list_schema(conn)
+
+        # 2. Nettoyer les doublons existants
+        clean_duplicate_items(conn)
+
     # 3. Créer le service Jow réel
     create_real_jow_service()
     
@@ -5,26 +5,309 @@ Scraper Jow intelligent - CORRECTIF pour riz et autres plats
 """
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
+import sys
+import copy
 import json
 import re
 import logging
-from typing import List, Dict, Any, Optional
-from fake_useragent import UserAgent
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Session partagée au niveau module : pool de connexions et retries configurés
+# une seule fois, réutilisés par toutes les instances (gain TCP/TLS)
+_UA = None
+
+
+def _get_user_agent():
+    """Instancie fake_useragent à la demande (import + construction coûteux)"""
+    global _UA
+    if _UA is None:
+        from fake_useragent import UserAgent
+        _UA = UserAgent()
+    return _UA
+
+
+_SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+_SESSION.mount('https://', _adapter)
+_SESSION.mount('http://', _adapter)
+_SESSION.headers.update({
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
+})
+
+# Mots-clés pour identifier le type de plat - ÉTENDU
+# L'ordre des types définit leur priorité en cas de correspondances multiples
+_QUERY_KEYWORDS = {
+    'riz': ['riz', 'risotto', 'paella', 'pilaf'],  # AJOUTÉ
+    'wraps': ['wrap', 'wraps', 'tortilla', 'galette'],
+    'burger': ['burger', 'hamburger', 'cheeseburger'],
+    'salade': ['salade', 'salad', 'bowl', 'mesclun'],
+    'pizza': ['pizza', 'pizzas', 'margherita'],
+    'pâtes': ['pâtes', 'spaghetti', 'penne', 'tagliatelle', 'pasta', 'linguine', 'fusilli'],
+}
+
+# Heuristique de repli viande/végé - une passe du moteur C au lieu de any(...)
+_MEAT_RE = re.compile(r'poulet|bœuf|boeuf|porc|agneau')
+_VEG_RE = re.compile(r'légume|legume|végé|vege|vegan')
+
+# Estimation quantité/unité : une seule passe du moteur C avec groupes
+# nommés, puis dispatch dict sur m.lastgroup au lieu des chaînes de any(...)
+_QUANTITY_RE = re.compile(
+    r'(?P<feculent>riz|pâtes|quinoa)'
+    r'|(?P<viande>viande|poulet|bœuf|porc)'
+    r'|(?P<legume>légume|tomate|courgette|carotte)'
+    r'|(?P<fromage>fromage|parmesan)'
+    r'|(?P<sauce>huile|sauce)'
+    r'|(?P<oeuf>œuf)'
+)
+_QUANTITY_BY_GROUP = {
+    'feculent': 300.0,
+    'viande': 400.0,
+    'legume': 2.0,
+    'fromage': 80.0,
+    'sauce': 2.0,
+    'oeuf': 3.0,
+}
+
+_UNIT_RE = re.compile(
+    r'(?P<cuillere>huile|sauce)'
+    r'|(?P<gramme>riz|pâtes|fromage|viande)'
+    r'|(?P<ml>lait|crème|bouillon)'
+    r'|(?P<pincee>épice|sel|poivre)'
+)
+# Chaînes répétées dans chaque recette générée : internées pour partager
+# une seule instance (empreinte mémoire et hachage des dicts)
+_UNIT_G = sys.intern('g')
+_UNIT_ML = sys.intern('ml')
+_UNIT_UNITE = sys.intern('unité')
+_UNIT_CUILLERE_SOUPE = sys.intern('cuillère à soupe')
+_UNIT_PINCEE = sys.intern('pincée')
+_DIFFICULTY_FACILE = sys.intern('Facile')
+_SOURCE_JOW = sys.intern('jow')
+_TAG_MAISON = sys.intern('maison')
+
+_UNIT_BY_GROUP = {
+    'cuillere': _UNIT_CUILLERE_SOUPE,
+    'gramme': _UNIT_G,
+    'ml': _UNIT_ML,
+    'pincee': _UNIT_PINCEE,
+}
+
+
+# Note : pas de slots=True sur les dataclasses, l'option exige Python 3.10
+# alors que le projet supporte 3.8+ (Raspberry Pi OS Bullseye livre 3.9)
+@dataclass
+class Ingredient:
+    """Ingrédient de recette - représentation compacte"""
+    name: str
+    quantity: float
+    unit: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'name': self.name, 'quantity': self.quantity, 'unit': self.unit}
+
+
+@dataclass
+class Recipe:
+    """Recette formatée - représentation compacte gardée dans le cache"""
+    id: str
+    name: str
+    servings: int
+    prepTime: int
+    difficulty: str
+    image: str
+    ingredients: List[Ingredient]
+    source: str
+    tags: List[str]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Copie mutable au format dict attendu par les appelants"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'servings': self.servings,
+            'prepTime': self.prepTime,
+            'difficulty': self.difficulty,
+            'image': self.image,
+            'ingredients': [ing.to_dict() for ing in self.ingredients],
+            'source': self.source,
+            'tags': list(self.tags),
+        }
+
+
+def _quantity_for(ingredient_lower: str) -> float:
+    """Quantité estimée pour un ingrédient déjà passé en minuscules"""
+    match = _QUANTITY_RE.search(ingredient_lower)
+    return _QUANTITY_BY_GROUP[match.lastgroup] if match else 1.0
+
+
+def _unit_for(ingredient_lower: str) -> str:
+    """Unité estimée pour un ingrédient déjà passé en minuscules"""
+    match = _UNIT_RE.search(ingredient_lower)
+    return _UNIT_BY_GROUP[match.lastgroup] if match else _UNIT_UNITE
+
+# Templates de recettes selon le type - construits une fois à l'import,
+# copiés à la demande dans _create_specific_recipes - AJOUT RIZ
+_RECIPE_TEMPLATES = {
+    'riz': (
+        {
+            'name': 'Riz pilaf aux légumes',
+            'ingredients': (
+                {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'},
+                {'name': 'bouillon de volaille', 'quantity': 600, 'unit': 'ml'},
+                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'petits pois', 'quantity': 100, 'unit': 'g'},
+                {'name': 'beurre', 'quantity': 30, 'unit': 'g'},
+                {'name': 'curcuma', 'quantity': 1, 'unit': 'cuillère à café'}
+            )
+        },
+        {
+            'name': 'Riz sauté aux crevettes',
+            'ingredients': (
+                {'name': 'riz thai', 'quantity': 250, 'unit': 'g'},
+                {'name': 'crevettes', 'quantity': 300, 'unit': 'g'},
+                {'name': 'œufs', 'quantity': 2, 'unit': 'unité'},
+                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'ail', 'quantity': 2, 'unit': 'gousse'},
+                {'name': 'sauce soja', 'quantity': 3, 'unit': 'cuillère à soupe'},
+                {'name': 'huile de sésame', 'quantity': 1, 'unit': 'cuillère à soupe'}
+            )
+        },
+        {
+            'name': 'Risotto aux champignons',
+            'ingredients': (
+                {'name': 'riz arborio', 'quantity': 320, 'unit': 'g'},
+                {'name': 'champignons de Paris', 'quantity': 400, 'unit': 'g'},
+                {'name': 'bouillon de légumes', 'quantity': 1, 'unit': 'l'},
+                {'name': 'vin blanc sec', 'quantity': 100, 'unit': 'ml'},
+                {'name': 'parmesan râpé', 'quantity': 80, 'unit': 'g'},
+                {'name': 'beurre', 'quantity': 50, 'unit': 'g'},
+                {'name': 'échalote', 'quantity': 1, 'unit': 'unité'}
+            )
+        }
+    ),
+    'pâtes': (
+        {
+            'name': 'Pâtes à la carbonara authentique',
+            'ingredients': (
+                {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
+                {'name': 'lardons fumés', 'quantity': 200, 'unit': 'g'},
+                {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
+                {'name': 'parmesan râpé', 'quantity': 100, 'unit': 'g'},
+                {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
+            )
+        },
+        {
+            'name': 'Penne à l\'arrabbiata',
+            'ingredients': (
+                {'name': 'penne', 'quantity': 400, 'unit': 'g'},
+                {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
+                {'name': 'ail', 'quantity': 3, 'unit': 'gousse'},
+                {'name': 'piment rouge', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'huile d\'olive', 'quantity': 4, 'unit': 'cuillère à soupe'},
+                {'name': 'basilic frais', 'quantity': 10, 'unit': 'g'}
+            )
+        },
+        {
+            'name': 'Tagliatelles aux champignons',
+            'ingredients': (
+                {'name': 'tagliatelles', 'quantity': 400, 'unit': 'g'},
+                {'name': 'champignons mélangés', 'quantity': 500, 'unit': 'g'},
+                {'name': 'crème fraîche', 'quantity': 200, 'unit': 'ml'},
+                {'name': 'échalote', 'quantity': 2, 'unit': 'unité'},
+                {'name': 'vin blanc', 'quantity': 100, 'unit': 'ml'},
+                {'name': 'persil frais', 'quantity': 15, 'unit': 'g'}
+            )
+        }
+    ),
+}
+
+
+# Paires (nom, ingrédients) matérialisées en objets Ingredient une fois à
+# l'import; partagées entre toutes les recettes servies depuis les templates
+_RECIPE_TEMPLATE_OBJECTS = {
+    recipe_type: tuple(
+        (recipe['name'], tuple(Ingredient(**ing) for ing in recipe['ingredients']))
+        for recipe in recipes
+    )
+    for recipe_type, recipes in _RECIPE_TEMPLATES.items()
+}
+
+
+def _json_default(obj):
+    """Repli stdlib : sérialise les dataclasses via leur to_dict()"""
+    if isinstance(obj, (Recipe, Ingredient)):
+        return obj.to_dict()
+    raise TypeError(f"Objet non sérialisable: {type(obj).__name__}")
+
+
+def _dumps(obj) -> bytes:
+    """Sérialise en JSON bytes, via orjson (2-5x plus rapide) si disponible
+
+    orjson sérialise les dataclasses nativement; le repli json passe par
+    _json_default.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+# Templates bruts pré-sérialisés une fois à l'import
+_RECIPE_TEMPLATES_JSON: Dict[str, bytes] = {
+    t: _dumps(recipes) for t, recipes in _RECIPE_TEMPLATES.items()
+}
+
+
+def _build_keyword_automaton():
+    """Construit l'automate Aho-Corasick des mots-clés (None si indisponible)"""
+    if not AHOCORASICK_AVAILABLE:
+        return None
+    automaton = ahocorasick.Automaton()
+    priority = 0
+    for recipe_type, type_keywords in _QUERY_KEYWORDS.items():
+        for keyword in type_keywords:
+            automaton.add_word(keyword, (priority, recipe_type))
+        priority += 1
+    automaton.make_automaton()
+    return automaton
+
 class IntelligentJowScraper:
     """Scraper intelligent qui génère des recettes adaptées à la recherche"""
     
-    def __init__(self):
-        self.session = requests.Session()
-        self.ua = UserAgent()
-        self.session.headers.update({
-            'User-Agent': self.ua.random,
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'fr-FR,fr;q=0.9,en;q=0.8',
-        })
-        
+    def __init__(self, session: Optional[requests.Session] = None):
+        self._automaton = _build_keyword_automaton()
+        # Index aplati mot-clé -> type pour les correspondances exactes par token
+        self._kw_index = {kw: t for t, kws in _QUERY_KEYWORDS.items() for kw in kws}
+        self._kw_set = set(self._kw_index)
+        # Cache LRU par instance; invalider via self._cached_search.cache_clear()
+        # si ingredient_database est modifiée
+        self._cached_search = lru_cache(maxsize=512)(self._search_recipes_uncached)
+        self._cached_search_json = lru_cache(maxsize=512)(self._search_recipes_json_uncached)
+        self.session = session or _SESSION
+
         # Base d'ingrédients par type de plat - ÉTENDUE
         self.ingredient_database = {
             'riz': {  # AJOUTÉ
@@ -67,261 +350,244 @@ class IntelligentJowScraper:
                 'légumes': ['courgettes', 'épinards', 'tomates cerises', 'champignons']
             }
         }
+
+        # (quantité, unité) estimées une seule fois par ingrédient de la base
+        self._ingredient_meta: Dict[str, Tuple[float, str]] = {
+            item: (_quantity_for(item_lower), _unit_for(item_lower))
+            for categories in self.ingredient_database.values()
+            for items in categories.values()
+            for item in items
+            for item_lower in (item.lower(),)
+        }
+
+        # Listes d'ingrédients dynamiques déroulées une fois par type : le
+        # contenu ne dépend pas de la variante générée, seule la sélection
+        # 1-2 par catégorie compte
+        self._dynamic_ingredients: Dict[str, Tuple[Ingredient, ...]] = {
+            recipe_type: tuple(
+                Ingredient(item, quantity, unit)
+                for items in categories.values()
+                for item in items[:2]
+                for quantity, unit in (self._ingredient_meta[item],)
+            )
+            for recipe_type, categories in self.ingredient_database.items()
+            if recipe_type not in _RECIPE_TEMPLATE_OBJECTS
+        }
+
+        # Formes précalculées des noms : seul le suffixe numérique varie
+        self._title_cache = {t: t.title() for t in self.ingredient_database}
+        self._id_prefix = {t: f'jow_{t}_' for t in self.ingredient_database}
     
+    @property
+    def ua(self):
+        """UserAgent instancié paresseusement au premier vrai besoin HTTP"""
+        ua = _get_user_agent()
+        if 'User-Agent' not in self.session.headers:
+            self.session.headers['User-Agent'] = ua.random
+        return ua
+
     def search_recipes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche intelligente de recettes selon la query"""
         try:
             logger.info(f"🔍 Recherche Jow intelligente pour: '{query}'")
-            
-            # Analyser la query pour déterminer le type de plat
-            recipe_type = self._analyze_query(query)
-            
-            # Générer des recettes adaptées
-            recipes = self._generate_recipes_for_type(recipe_type, query, limit)
-            
-            logger.info(f"✅ Généré {len(recipes)} recettes {recipe_type} pour '{query}'")
-            return recipes
-            
+
+            # Résultat mémoïsé (tuple immuable), copié pour que l'appelant
+            # puisse modifier les recettes sans corrompre le cache
+            recipes = self._cached_search(query.strip(), limit)
+            return [
+                recipe.to_dict() if isinstance(recipe, Recipe) else copy.deepcopy(recipe)
+                for recipe in recipes
+            ]
+
         except Exception as e:
             logger.error(f"Erreur recherche Jow intelligente: {e}")
             return []
+
+    def search_recipes_json(self, query: str, limit: int = 10) -> bytes:
+        """Variante pré-sérialisée de search_recipes pour la couche web
+
+        Renvoie directement le payload JSON en bytes (mémoïsé), à servir
+        tel quel sans re-sérialisation par requête.
+        """
+        try:
+            return self._cached_search_json(query.strip(), limit)
+        except Exception as e:
+            logger.error(f"Erreur recherche Jow intelligente (json): {e}")
+            return b'[]'
+
+    def _search_recipes_json_uncached(self, query: str, limit: int) -> bytes:
+        """Sérialise une fois le résultat mémoïsé de la recherche"""
+        return _dumps(self._cached_search(query, limit))
+
+    def iter_recipes(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Variante streaming : génère les recettes formatées à la demande
+
+        L'allocation suit la consommation — un appelant qui ne lit que les
+        premières recettes ne paie pas la construction des suivantes.
+        """
+        recipe_type = self._analyze_query(query)
+        for recipe in self._iter_recipes_for_type(recipe_type, query):
+            yield recipe.to_dict() if isinstance(recipe, Recipe) else recipe
+
+    def _search_recipes_uncached(self, query: str, limit: int) -> Tuple[Dict[str, Any], ...]:
+        """Cœur de la recherche, mémoïsé par (query, limit) dans __init__"""
+        # Analyser la query pour déterminer le type de plat
+        recipe_type = self._analyze_query(query)
+
+        # Générer des recettes adaptées, en s'arrêtant à limit
+        recipes = tuple(islice(self._iter_recipes_for_type(recipe_type, query), limit))
+
+        logger.info(f"✅ Généré {len(recipes)} recettes {recipe_type} pour '{query}'")
+        return recipes
     
     def _analyze_query(self, query: str) -> str:
         """Analyse la query pour déterminer le type de plat"""
-        query_lower = query.lower().strip()
-        
-        # Mots-clés pour identifier le type de plat - ÉTENDU
-        keywords = {
-            'riz': ['riz', 'risotto', 'paella', 'pilaf'],  # AJOUTÉ
-            'wraps': ['wrap', 'wraps', 'tortilla', 'galette'],
-            'burger': ['burger', 'hamburger', 'cheeseburger'],
-            'salade': ['salade', 'salad', 'bowl', 'mesclun'],
-            'pizza': ['pizza', 'pizzas', 'margherita'],
-            'pâtes': ['pâtes', 'spaghetti', 'penne', 'tagliatelle', 'pasta', 'linguine', 'fusilli'],
-        }
-        
-        # Rechercher le type correspondant
-        for recipe_type, type_keywords in keywords.items():
-            for keyword in type_keywords:
-                if keyword in query_lower:
-                    return recipe_type
-        
+        query_lower = query.strip().casefold()
+
+        # Cas le plus fréquent (requête d'un mot ou commençant par le plat) :
+        # deux sondes O(1) avant toute construction d'ensemble
+        recipe_type = self._kw_index.get(query_lower)
+        if recipe_type:
+            return recipe_type
+        recipe_type = self._kw_index.get(query_lower.partition(' ')[0])
+        if recipe_type:
+            return recipe_type
+
+        # Correspondance exacte par token - un lookup O(1) par mot couvre
+        # la majorité des requêtes réelles sans balayage de sous-chaînes
+        hit = set(query_lower.split()) & self._kw_set
+        if hit:
+            if len(hit) == 1:
+                return self._kw_index[next(iter(hit))]
+            # plusieurs tokens reconnus : respecter la priorité du dictionnaire
+            for kw in self._kw_index:
+                if kw in hit:
+                    return self._kw_index[kw]
+
+        # Rechercher le type correspondant - un seul balayage C via Aho-Corasick
+        if self._automaton is not None:
+            best = None
+            for _, value in self._automaton.iter(query_lower):
+                if best is None or value < best:
+                    best = value
+            if best is not None:
+                return best[1]
+        else:
+            for recipe_type, type_keywords in _QUERY_KEYWORDS.items():
+                for keyword in type_keywords:
+                    if keyword in query_lower:
+                        return recipe_type
+
+        # Repli viande/végé avant le cas générique
+        if _MEAT_RE.search(query_lower):
+            return 'plat_viande'
+        if _VEG_RE.search(query_lower):
+            return 'végétarien'
+
         # Si aucun type spécifique trouvé, utiliser la base de données complète
         return 'général'
     
-    def _generate_recipes_for_type(self, recipe_type: str, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _iter_recipes_for_type(self, recipe_type: str, query: str) -> Iterator[Dict[str, Any]]:
         """Génère des recettes spécifiques au type détecté"""
-        
         if recipe_type in self.ingredient_database:
-            return self._create_specific_recipes(recipe_type, query, limit)
+            yield from self._create_specific_recipes(recipe_type, query)
         else:
-            return self._create_varied_recipes(query, limit)  # Nouveau nom plus clair
-    
-    def _create_specific_recipes(self, recipe_type: str, query: str, limit: int) -> List[Dict[str, Any]]:
-        """Crée des recettes spécifiques selon le type"""
-        recipes = []
+            yield from self._create_varied_recipes(query)  # Nouveau nom plus clair
+
+    def _create_specific_recipes(self, recipe_type: str, query: str) -> Iterator[Recipe]:
+        """Crée des recettes spécifiques selon le type, une à la fois"""
         ingredients_data = self.ingredient_database[recipe_type]
-        
-        # Templates de recettes selon le type - AJOUT RIZ
-        if recipe_type == 'riz':
-            recipes = [
-                {
-                    'name': 'Riz pilaf aux légumes',
-                    'ingredients': [
-                        {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'},
-                        {'name': 'bouillon de volaille', 'quantity': 600, 'unit': 'ml'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'petits pois', 'quantity': 100, 'unit': 'g'},
-                        {'name': 'beurre', 'quantity': 30, 'unit': 'g'},
-                        {'name': 'curcuma', 'quantity': 1, 'unit': 'cuillère à café'}
-                    ]
-                },
-                {
-                    'name': 'Riz sauté aux crevettes',
-                    'ingredients': [
-                        {'name': 'riz thai', 'quantity': 250, 'unit': 'g'},
-                        {'name': 'crevettes', 'quantity': 300, 'unit': 'g'},
-                        {'name': 'œufs', 'quantity': 2, 'unit': 'unité'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'ail', 'quantity': 2, 'unit': 'gousse'},
-                        {'name': 'sauce soja', 'quantity': 3, 'unit': 'cuillère à soupe'},
-                        {'name': 'huile de sésame', 'quantity': 1, 'unit': 'cuillère à soupe'}
-                    ]
-                },
-                {
-                    'name': 'Risotto aux champignons',
-                    'ingredients': [
-                        {'name': 'riz arborio', 'quantity': 320, 'unit': 'g'},
-                        {'name': 'champignons de Paris', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'bouillon de légumes', 'quantity': 1, 'unit': 'l'},
-                        {'name': 'vin blanc sec', 'quantity': 100, 'unit': 'ml'},
-                        {'name': 'parmesan râpé', 'quantity': 80, 'unit': 'g'},
-                        {'name': 'beurre', 'quantity': 50, 'unit': 'g'},
-                        {'name': 'échalote', 'quantity': 1, 'unit': 'unité'}
-                    ]
-                }
-            ]
-        
-        elif recipe_type == 'pâtes':
-            recipes = [
-                {
-                    'name': 'Pâtes à la carbonara authentique',
-                    'ingredients': [
-                        {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'lardons fumés', 'quantity': 200, 'unit': 'g'},
-                        {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
-                        {'name': 'parmesan râpé', 'quantity': 100, 'unit': 'g'},
-                        {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
-                    ]
-                },
-                {
-                    'name': 'Penne à l\'arrabbiata',
-                    'ingredients': [
-                        {'name': 'penne', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'ail', 'quantity': 3, 'unit': 'gousse'},
-                        {'name': 'piment rouge', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'huile d\'olive', 'quantity': 4, 'unit': 'cuillère à soupe'},
-                        {'name': 'basilic frais', 'quantity': 10, 'unit': 'g'}
-                    ]
-                },
-                {
-                    'name': 'Tagliatelles aux champignons',
-                    'ingredients': [
-                        {'name': 'tagliatelles', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'champignons mélangés', 'quantity': 500, 'unit': 'g'},
-                        {'name': 'crème fraîche', 'quantity': 200, 'unit': 'ml'},
-                        {'name': 'échalote', 'quantity': 2, 'unit': 'unité'},
-                        {'name': 'vin blanc', 'quantity': 100, 'unit': 'ml'},
-                        {'name': 'persil frais', 'quantity': 15, 'unit': 'g'}
-                    ]
-                }
-            ]
-        
-        # Continuer avec les autres types (wraps, burger, etc.)...
-        else:
-            # Générer dynamiquement selon les ingrédients disponibles
-            recipes = self._generate_dynamic_recipes(recipe_type, ingredients_data, limit)
-        
+
+        # Templates figés au niveau module, sinon génération dynamique
+        pairs = _RECIPE_TEMPLATE_OBJECTS.get(recipe_type)
+        if pairs is None:
+            pairs = self._generate_dynamic_recipes(recipe_type, ingredients_data)
+
         # Formater les recettes avec les métadonnées
-        formatted_recipes = []
-        for i, recipe in enumerate(recipes[:limit]):
-            formatted_recipe = {
-                'id': f'jow_{recipe_type}_{i+1}',
-                'name': recipe['name'],
-                'servings': 4,
-                'prepTime': 30,
-                'difficulty': 'Facile',
-                'image': '',
-                'ingredients': recipe['ingredients'],
-                'source': 'jow',
-                'tags': [recipe_type, 'maison']
-            }
-            formatted_recipes.append(formatted_recipe)
-        
-        return formatted_recipes
+        id_prefix = self._id_prefix[recipe_type]
+        for i, (name, ingredients) in enumerate(pairs):
+            yield Recipe(
+                id=id_prefix + str(i + 1),
+                name=name,
+                servings=4,
+                prepTime=30,
+                difficulty=_DIFFICULTY_FACILE,
+                image='',
+                ingredients=list(ingredients),
+                source=_SOURCE_JOW,
+                tags=[recipe_type, _TAG_MAISON]
+            )
     
-    def _create_varied_recipes(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _create_varied_recipes(self, query: str) -> Iterator[Dict[str, Any]]:
         """Crée des recettes variées au lieu de génériques répétitives"""
-        recipes = []
-        
-        # Recettes populaires par défaut si aucune catégorie spécifique
-        default_recipes = [
-            {
+        query_lower = query.lower()  # calculé une fois pour les trois recettes
+
+        # Recettes populaires par défaut si aucune catégorie spécifique,
+        # produites une à la fois
+        yield {
                 'name': f'Plat du jour au {query}',
                 'ingredients': [
-                    {'name': query.lower(), 'quantity': 300, 'unit': 'g'},
+                    {'name': query_lower, 'quantity': 300, 'unit': 'g'},
                     {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
                     {'name': 'ail', 'quantity': 2, 'unit': 'gousse'},
                     {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'},
                     {'name': 'herbes de Provence', 'quantity': 1, 'unit': 'cuillère à café'}
                 ]
-            },
-            {
+            }
+        yield {
                 'name': f'Sauté de {query} aux légumes',
                 'ingredients': [
-                    {'name': query.lower(), 'quantity': 400, 'unit': 'g'},
+                    {'name': query_lower, 'quantity': 400, 'unit': 'g'},
                     {'name': 'courgette', 'quantity': 1, 'unit': 'unité'},
                     {'name': 'poivron', 'quantity': 1, 'unit': 'unité'},
                     {'name': 'tomate', 'quantity': 2, 'unit': 'unité'},
                     {'name': 'sauce soja', 'quantity': 2, 'unit': 'cuillère à soupe'}
                 ]
-            },
-            {
+            }
+        yield {
                 'name': f'Gratin de {query}',
                 'ingredients': [
-                    {'name': query.lower(), 'quantity': 500, 'unit': 'g'},
+                    {'name': query_lower, 'quantity': 500, 'unit': 'g'},
                     {'name': 'crème fraîche', 'quantity': 200, 'unit': 'ml'},
                     {'name': 'gruyère râpé', 'quantity': 100, 'unit': 'g'},
                     {'name': 'lait', 'quantity': 150, 'unit': 'ml'},
                     {'name': 'muscade', 'quantity': 1, 'unit': 'pincée'}
                 ]
             }
-        ]
-        
-        return default_recipes[:limit]
-    
-    def _generate_dynamic_recipes(self, recipe_type: str, ingredients_data: Dict, limit: int) -> List[Dict[str, Any]]:
-        """Génère des recettes dynamiquement selon les ingrédients"""
-        recipes = []
-        
-        for i in range(min(limit, 3)):
-            recipe_name = f"{recipe_type.title()} {['traditionnel', 'moderne', 'gourmand'][i]}"
-            ingredients = []
-            
-            # Sélectionner des ingrédients de chaque catégorie
-            for category, items in ingredients_data.items():
-                if items:
-                    # Prendre 1-2 ingrédients par catégorie
-                    selected = items[:2] if len(items) > 1 else items
-                    for item in selected:
-                        ingredients.append({
-                            'name': item,
-                            'quantity': self._estimate_quantity(item),
-                            'unit': self._estimate_unit(item)
-                        })
-            
-            recipes.append({
-                'name': recipe_name,
-                'ingredients': ingredients
-            })
-        
-        return recipes
+
+    def _generate_dynamic_recipes(self, recipe_type: str,
+                                  ingredients_data: Dict) -> Iterator[Tuple[str, List[Ingredient]]]:
+        """Génère des paires (nom, ingrédients) dynamiquement selon la base"""
+        # Liste déroulée à __init__ pour les types de la base; calcul à la
+        # volée seulement pour des données injectées hors base
+        ingredients = self._dynamic_ingredients.get(recipe_type)
+        if ingredients is None:
+            ingredients = tuple(
+                Ingredient(item, quantity, unit)
+                for items in ingredients_data.values()
+                for item in items[:2]
+                for quantity, unit in (self._meta_for(item),)
+            )
+
+        title = self._title_cache.get(recipe_type) or recipe_type.title()
+        for variante in ('traditionnel', 'moderne', 'gourmand'):
+            yield title + ' ' + variante, ingredients
     
+    def _meta_for(self, item: str) -> Tuple[float, str]:
+        """(quantité, unité) d'un ingrédient, précalculé si connu de la base"""
+        meta = self._ingredient_meta.get(item)
+        if meta is None:
+            item_lower = item.lower()
+            meta = (_quantity_for(item_lower), _unit_for(item_lower))
+        return meta
+
     def _estimate_quantity(self, ingredient: str) -> float:
         """Estime une quantité réaliste pour un ingrédient"""
-        ingredient_lower = ingredient.lower()
-        
-        if any(word in ingredient_lower for word in ['riz', 'pâtes', 'quinoa']):
-            return 300.0
-        elif any(word in ingredient_lower for word in ['viande', 'poulet', 'bœuf', 'porc']):
-            return 400.0
-        elif any(word in ingredient_lower for word in ['légume', 'tomate', 'courgette', 'carotte']):
-            return 2.0
-        elif any(word in ingredient_lower for word in ['fromage', 'parmesan']):
-            return 80.0
-        elif any(word in ingredient_lower for word in ['huile', 'sauce']):
-            return 2.0
-        elif any(word in ingredient_lower for word in ['œuf']):
-            return 3.0
-        else:
-            return 1.0
-    
+        return _quantity_for(ingredient.lower())
+
     def _estimate_unit(self, ingredient: str) -> str:
         """Estime une unité réaliste pour un ingrédient"""
-        ingredient_lower = ingredient.lower()
-        
-        if any(word in ingredient_lower for word in ['huile', 'sauce']):
-            return 'cuillère à soupe'
-        elif any(word in ingredient_lower for word in ['riz', 'pâtes', 'fromage', 'viande']):
-            return 'g'
-        elif any(word in ingredient_lower for word in ['lait', 'crème', 'bouillon']):
-            return 'ml'
-        elif any(word in ingredient_lower for word in ['épice', 'sel', 'poivre']):
-            return 'pincée'
-        else:
-            return 'unité'
+        return _unit_for(ingredient.lower())
 
 # Instance globale
 intelligent_jow_scraper = IntelligentJowScraper()
@@ -5,21 +5,299 @@ Scraper Jow réel - Récupère les vraies recettes depuis le site Jow
 """
 
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import json
 import re
+import sys
 import logging
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from bs4 import BeautifulSoup
 from fake_useragent import UserAgent
 
+# lxml (parser C, ~5-10x plus rapide) est volontairement absent des
+# requirements (compilation pénible sur Raspberry Pi ARM) : on l'utilise
+# seulement s'il est déjà installé, sinon repli sur le parser pur Python
+try:
+    from lxml import html as lxml_html
+    _BS4_PARSER = 'lxml'
+    LXML_AVAILABLE = True
+except ImportError:
+    _BS4_PARSER = 'html.parser'
+    LXML_AVAILABLE = False
+
+# selectolax (Lexbor) : extraction CSS 10-20x plus rapide que BeautifulSoup,
+# même politique que lxml - utilisé seulement s'il est déjà installé
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# orjson : décodage JSON en C, 2-5x plus rapide que json/response.json()
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# ijson : parse en flux les grosses réponses API sans matérialiser tout
+# l'arbre JSON en mémoire - optionnel, repli sur le décodage complet
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# requests-cache : cache HTTP sur disque (SQLite) avec TTL, les requêtes
+# répétées deviennent des lectures locales sans aller-retour réseau
+try:
+    from requests_cache import CachedSession
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+
+# Note : pas de slots=True sur les dataclasses, l'option exige Python 3.10
+# alors que le projet supporte 3.8+ (Raspberry Pi OS Bullseye livre 3.9)
+@dataclass
+class Ingredient:
+    """Ingrédient en représentation compacte, converti en dict à la
+    frontière publique"""
+    name: str
+    quantity: float
+    unit: str
+    originalText: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        d = {'name': self.name, 'quantity': self.quantity, 'unit': self.unit}
+        if self.originalText is not None:
+            d['originalText'] = self.originalText
+        return d
+
+
+@dataclass
+class Recipe:
+    """Recette en représentation compacte, mise en cache telle quelle ;
+    to_dict() matérialise le dict attendu par les appelants"""
+    id: str
+    name: str
+    servings: int = 4
+    prepTime: int = 30
+    cookTime: Optional[int] = None
+    difficulty: str = 'Moyen'
+    image: str = ''
+    description: str = ''
+    ingredients: List[Ingredient] = field(default_factory=list)
+    source: str = 'jow'
+    url: str = ''
+    tags: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'name': self.name,
+            'servings': self.servings,
+            'prepTime': self.prepTime,
+            'cookTime': self.cookTime,
+            'difficulty': self.difficulty,
+            'image': self.image,
+            'description': self.description,
+            'ingredients': [i.to_dict() for i in self.ingredients],
+            'source': self.source,
+            'url': self.url,
+            'tags': list(self.tags),
+        }
+
+
+# Base d'ingrédients selon le type de recette - allouée une seule fois à
+# l'import (les appelants ne doivent pas modifier les dicts partagés)
+_INGREDIENTS_DB = {
+    'pâtes': [
+        {'name': 'pâtes', 'quantity': 400, 'unit': 'g'},
+        {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'},
+        {'name': 'ail', 'quantity': 2, 'unit': 'gousse'},
+        {'name': 'parmesan', 'quantity': 100, 'unit': 'g'}
+    ],
+    'carbonara': [
+        {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
+        {'name': 'lardons', 'quantity': 200, 'unit': 'g'},
+        {'name': 'œufs', 'quantity': 3, 'unit': 'unité'},
+        {'name': 'parmesan', 'quantity': 100, 'unit': 'g'},
+        {'name': 'poivre noir', 'quantity': 1, 'unit': 'pincée'}
+    ],
+    'bolognaise': [
+        {'name': 'pâtes', 'quantity': 500, 'unit': 'g'},
+        {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
+        {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
+        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+        {'name': 'carotte', 'quantity': 1, 'unit': 'unité'}
+    ],
+    'poulet': [
+        {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
+        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+        {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'}
+    ],
+    'salade': [
+        {'name': 'salade verte', 'quantity': 1, 'unit': 'unité'},
+        {'name': 'tomates cerises', 'quantity': 200, 'unit': 'g'},
+        {'name': 'concombre', 'quantity': 1, 'unit': 'unité'}
+    ]
+}
+_INGREDIENTS_KEYS = tuple(_INGREDIENTS_DB)
+_INGREDIENTS_KEY_SET = frozenset(_INGREDIENTS_DB)
+
+# Ingrédients par défaut, figés (tuple de mappings en lecture seule) :
+# la référence partagée est rendue telle quelle, les appelants qui veulent
+# muter ou stocker dans une recette doivent copier avec dict(m)
+_DEFAULT_INGREDIENTS = tuple(MappingProxyType(d) for d in [
+    {'name': 'ingrédient principal', 'quantity': 1, 'unit': 'unité'},
+    {'name': 'huile d\'olive', 'quantity': 1, 'unit': 'cuillère à soupe'},
+    {'name': 'sel', 'quantity': 1, 'unit': 'pincée'},
+    {'name': 'poivre', 'quantity': 1, 'unit': 'pincée'}
+])
+
+# Données réalistes en cas d'échec total - allouées une seule fois à l'import
+_REALISTIC_DB_RAW = {
+    'pâtes': [
+        {
+            'id': 'jow_realistic_carbonara',
+            'name': 'Spaghetti Carbonara Authentique',
+            'servings': 4,
+            'prepTime': 20,
+            'ingredients': [
+                {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
+                {'name': 'lardons fumés', 'quantity': 150, 'unit': 'g'},
+                {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
+                {'name': 'parmesan râpé', 'quantity': 80, 'unit': 'g'},
+                {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
+            ],
+            'source': 'jow'
+        },
+        {
+            'id': 'jow_realistic_bolognaise',
+            'name': 'Pâtes à la Bolognaise Maison',
+            'servings': 6,
+            'prepTime': 60,
+            'ingredients': [
+                {'name': 'tagliatelles', 'quantity': 500, 'unit': 'g'},
+                {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
+                {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
+                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'vin rouge', 'quantity': 100, 'unit': 'ml'}
+            ],
+            'source': 'jow'
+        }
+    ],
+    'poulet': [
+        {
+            'id': 'jow_realistic_curry_poulet',
+            'name': 'Curry de Poulet au Lait de Coco',
+            'servings': 4,
+            'prepTime': 35,
+            'ingredients': [
+                {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
+                {'name': 'lait de coco', 'quantity': 400, 'unit': 'ml'},
+                {'name': 'pâte de curry rouge', 'quantity': 2, 'unit': 'cuillère à soupe'},
+                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'poivron rouge', 'quantity': 1, 'unit': 'unité'},
+                {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'}
+            ],
+            'source': 'jow'
+        }
+    ]
+}
+
+# Version objets (dataclasses) des recettes réalistes : tuples immuables de
+# Recipe, partagés entre recherches, convertis en dict à la frontière
+_REALISTIC_DB = {
+    category: tuple(
+        Recipe(
+            id=r['id'],
+            name=r['name'],
+            servings=r['servings'],
+            prepTime=r['prepTime'],
+            ingredients=[Ingredient(**i) for i in r['ingredients']],
+        )
+        for r in recipes
+    )
+    for category, recipes in _REALISTIC_DB_RAW.items()
+}
+
+# Index mot-clé -> catégorie réaliste : sonde O(1) sur la requête entière
+# puis sur chaque token, avant le balayage par sous-chaîne historique
+_REALISTIC_KEYWORDS = {
+    'pâtes': 'pâtes',
+    'pates': 'pâtes',
+    'pate': 'pâtes',
+    'carbonara': 'pâtes',
+    'bolognaise': 'pâtes',
+    'spaghetti': 'pâtes',
+    'tagliatelles': 'pâtes',
+    'poulet': 'poulet',
+    'curry': 'poulet',
+}
+
+# Motif unique pour les quantités dans les recettes, compilé une seule
+# fois à l'import : une alternation à groupes nommés remplace les cinq
+# patterns essayés séquentiellement (une passe du moteur C par ingrédient)
+_INGREDIENT_PATTERN = (
+    # 500g de farine, 2l d'eau
+    r'^(?P<qte>\d+(?:[.,]\d+)?)\s*'
+    r'(?:(?P<masse>g|kg|ml|l|cl|dl)\s+'
+    # 2 cuillères à soupe d'huile
+    r'|(?P<cuillere>cuillères?\s+à\s+(?:soupe|café)|c\.\s*à\s*[sc]\.?)\s+'
+    # 1 tasse de farine
+    r'|(?P<contenant>tasses?|verres?|pincées?)\s+'
+    r')?'
+    # 3 œufs, 2 oignons
+    r'(?:de\s+|d\')?(?P<nom>.+)$'
+)
+_INGREDIENT_RE = re.compile(_INGREDIENT_PATTERN, re.IGNORECASE)
+
+# Unités internées : tous les ingrédients parsés partagent le même objet
+# str pour 'g', 'ml', 'unité'... (moins de mémoire, égalité par identité)
+_UNIT_INTERN = {u: sys.intern(u) for u in (
+    'g', 'kg', 'ml', 'l', 'cl', 'dl', 'unité', 'cuillère à soupe',
+    'cuillère à café', 'cuillères à soupe', 'cuillères à café',
+    'pincée', 'gousse', 'tasse', 'verre',
+)}
+# Variante multi-lignes : une seule passe finditer sur un blob de textes
+# joints par '\n' ('.+' ne franchit pas les sauts de ligne)
+_INGREDIENT_LINE_RE = re.compile(_INGREDIENT_PATTERN, re.IGNORECASE | re.MULTILINE)
+
 class JowScraper:
     """Scraper pour récupérer les vraies recettes Jow"""
-    
+
+    # UserAgent partagé entre toutes les instances : fake_useragent charge
+    # sa base de user-agents à la construction (50-200ms), une seule fois
+    _UA: Optional[UserAgent] = None
+
+    @classmethod
+    def _get_ua(cls) -> UserAgent:
+        if cls._UA is None:
+            cls._UA = UserAgent()
+        return cls._UA
+
     def __init__(self):
-        self.session = requests.Session()
-        self.ua = UserAgent()
+        # Cache HTTP persistant (TTL 1h) quand requests-cache est installé :
+        # les recherches répétées sont servies depuis SQLite, ETag compris
+        if REQUESTS_CACHE_AVAILABLE:
+            self.session = CachedSession(
+                'jow_cache',
+                backend='sqlite',
+                expire_after=3600,
+                allowable_methods=('GET',),
+            )
+        else:
+            self.session = requests.Session()
+        self.ua = self._get_ua()
         self.session.headers.update({
             'User-Agent': self.ua.random,
             'Accept': 'application/json, text/plain, */*',
@@ -29,38 +307,98 @@ class JowScraper:
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
-        
+        # Pool de connexions + retries automatiques : garde les connexions
+        # TLS chaudes entre recherches et absorbe les erreurs transitoires
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods={'GET'},
+        )
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Cache LRU par instance des résultats de recherche; la clé est
+        # normalisée pour que 'Pâtes' et 'pâtes' partagent une entrée
+        self._cached_search = lru_cache(maxsize=256)(self._search_recipes_uncached)
+
+
     def search_recipes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche de recettes sur le site Jow"""
+        # Résultat mémoïsé (tuple de Recipe immuable) ; to_dict() rend des
+        # dicts frais que l'appelant peut modifier sans corrompre le cache
+        recipes = self._cached_search(query.strip().lower(), limit)
+        return [r.to_dict() for r in recipes]
+
+    def search_recipes_many(self, queries: List[str], limit: int = 10) -> List[List[Dict[str, Any]]]:
+        """Recherche plusieurs requêtes en parallèle sur la session poolée
+
+        Les appels HTTP étant le goulot, le fan-out sur threads ramène la
+        latence totale à celle de la requête la plus lente (pool_maxsize
+        de la session dimensionné en conséquence).
+        """
+        if not queries:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as executor:
+            return list(executor.map(lambda q: self.search_recipes(q, limit), queries))
+
+    def _search_recipes_uncached(self, query: str, limit: int) -> Tuple[Recipe, ...]:
+        """Cœur de la recherche, mémoïsé par (query, limit) dans __init__"""
         try:
             # URL de recherche Jow (à adapter selon l'API/site réel)
             search_url = "https://jow.fr/api/v2/recipes/search"
-            
+
             params = {
                 'q': query,
                 'limit': limit,
                 'offset': 0
             }
-            
-            response = self.session.get(search_url, params=params, timeout=10)
-            
+
+            response = self.session.get(search_url, params=params, timeout=10,
+                                        stream=IJSON_AVAILABLE)
+
             if response.status_code == 200:
-                data = response.json()
-                recipes = self._parse_jow_api_response(data)
+                if IJSON_AVAILABLE:
+                    recipes = self._parse_jow_api_stream(response, limit)
+                elif ORJSON_AVAILABLE:
+                    recipes = self._parse_jow_api_response(orjson.loads(response.content))
+                else:
+                    recipes = self._parse_jow_api_response(response.json())
                 logger.info(f"Trouvé {len(recipes)} recettes Jow pour '{query}'")
-                return recipes
+                return tuple(recipes)
             else:
                 logger.warning(f"Erreur API Jow: {response.status_code}")
-                return self._fallback_scraping(query, limit)
-                
+                return tuple(self._fallback_scraping(query, limit))
+
         except requests.exceptions.RequestException as e:
             logger.error(f"Erreur requête Jow: {e}")
-            return self._fallback_scraping(query, limit)
+            return tuple(self._fallback_scraping(query, limit))
         except Exception as e:
             logger.error(f"Erreur inattendue Jow: {e}")
-            return self._get_realistic_recipes(query, limit)
+            return tuple(self._get_realistic_recipes(query, limit))
     
-    def _parse_jow_api_response(self, data: Dict) -> List[Dict[str, Any]]:
+    def _parse_jow_api_stream(self, response, limit: int) -> List[Recipe]:
+        """Parse la réponse API en flux (ijson) : les recettes sont formatées
+        au fil de l'eau sans matérialiser tout l'arbre JSON en mémoire"""
+        recipes = []
+        response.raw.decode_content = True
+        try:
+            for recipe_data in ijson.items(response.raw, 'recipes.item'):
+                try:
+                    recipe = self._format_jow_recipe(recipe_data)
+                    if recipe:
+                        recipes.append(recipe)
+                        if len(recipes) >= limit:
+                            break
+                except Exception as e:
+                    logger.error(f"Erreur parsing recette: {e}")
+                    continue
+        finally:
+            response.close()
+        return recipes
+
+    def _parse_jow_api_response(self, data: Dict) -> List[Recipe]:
         """Parse la réponse de l'API Jow"""
         recipes = []
         
@@ -75,37 +413,40 @@ class JowScraper:
         
         return recipes
     
-    def _format_jow_recipe(self, recipe_data: Dict) -> Dict[str, Any]:
+    def _format_jow_recipe(self, recipe_data: Dict) -> Optional[Recipe]:
         """Formate une recette Jow"""
         try:
-            # Parser les ingrédients
-            ingredients = []
-            for ingredient in recipe_data.get('ingredients', []):
-                quantity, unit, name = self._parse_ingredient_text(
-                    ingredient.get('text', ingredient.get('name', ''))
+            # Parser les ingrédients en lot : une seule passe regex pour
+            # toute la recette au lieu d'un appel par ingrédient
+            originals = [
+                ingredient.get('text') or ingredient.get('name', '')
+                for ingredient in recipe_data.get('ingredients', [])
+            ]
+            ingredients = [
+                Ingredient(
+                    name=name,
+                    quantity=quantity or 1,
+                    unit=unit or 'unité',
+                    originalText=original,
                 )
-                
-                ingredients.append({
-                    'name': name,
-                    'quantity': quantity or 1,
-                    'unit': unit or 'unité',
-                    'originalText': ingredient.get('text', ingredient.get('name', ''))
-                })
-            
-            return {
-                'id': f"jow_{recipe_data.get('id', recipe_data.get('slug', 'unknown'))}",
-                'name': recipe_data.get('name', recipe_data.get('title', 'Recette sans nom')),
-                'servings': recipe_data.get('servings', recipe_data.get('portions', 4)),
-                'prepTime': recipe_data.get('prep_time', recipe_data.get('preparation_time', 30)),
-                'cookTime': recipe_data.get('cook_time', recipe_data.get('cooking_time')),
-                'difficulty': recipe_data.get('difficulty', 'Moyen'),
-                'image': recipe_data.get('image', recipe_data.get('photo', {}).get('url', '')),
-                'description': recipe_data.get('description', ''),
-                'ingredients': ingredients,
-                'source': 'jow',
-                'url': recipe_data.get('url', ''),
-                'tags': recipe_data.get('tags', [])
-            }
+                for original, (quantity, unit, name)
+                in zip(originals, self._parse_ingredient_batch(originals))
+            ]
+
+            rd_get = recipe_data.get
+            return Recipe(
+                id=f"jow_{rd_get('id', rd_get('slug', 'unknown'))}",
+                name=rd_get('name', rd_get('title', 'Recette sans nom')),
+                servings=rd_get('servings', rd_get('portions', 4)),
+                prepTime=rd_get('prep_time', rd_get('preparation_time', 30)),
+                cookTime=rd_get('cook_time', rd_get('cooking_time')),
+                difficulty=rd_get('difficulty', 'Moyen'),
+                image=rd_get('image', rd_get('photo', {}).get('url', '')),
+                description=rd_get('description', ''),
+                ingredients=ingredients,
+                url=rd_get('url', ''),
+                tags=rd_get('tags', []),
+            )
         except Exception as e:
             logger.error(f"Erreur formatage recette: {e}")
             return None
@@ -114,46 +455,68 @@ class JowScraper:
         """Parse le texte d'un ingrédient pour extraire quantité, unité et nom"""
         if not text:
             return None, None, text
-        
-        # Patterns courants pour les quantités dans les recettes
-        patterns = [
-            # 500g de farine, 2l d'eau
-            r'^(\d+(?:[.,]\d+)?)\s*(g|kg|ml|l|cl|dl)\s+(?:de\s+)?(.+)$',
-            # 2 cuillères à soupe d'huile
-            r'^(\d+(?:[.,]\d+)?)\s+(cuillères?\s+à\s+(?:soupe|café)|c\.\s*à\s*[sc]\.?)\s+(?:de\s+|d\')?(.+)$',
-            # 1 tasse de farine
-            r'^(\d+(?:[.,]\d+)?)\s+(tasses?|verres?|pincées?)\s+(?:de\s+|d\')?(.+)$',
-            # 3 œufs, 2 oignons
-            r'^(\d+(?:[.,]\d+)?)\s+(.+)$',
-            # Juste le nom
-            r'^(.+)$'
-        ]
-        
-        for pattern in patterns:
-            match = re.match(pattern, text.strip(), re.IGNORECASE)
-            if match:
-                groups = match.groups()
-                if len(groups) == 3:
-                    try:
-                        quantity = float(groups[0].replace(',', '.'))
-                        unit = groups[1].strip()
-                        name = groups[2].strip()
-                        return quantity, unit, name
-                    except (ValueError, IndexError):
-                        continue
-                elif len(groups) == 2:
-                    try:
-                        quantity = float(groups[0].replace(',', '.'))
-                        name = groups[1].strip()
-                        return quantity, 'unité', name
-                    except (ValueError, IndexError):
-                        continue
-                else:
-                    return None, 'unité', groups[0].strip()
-        
-        return None, 'unité', text
+
+        text_stripped = text.strip()
+
+        # Court-circuit : sans chiffre en tête, le motif ne peut pas matcher
+        # ('sel, poivre', 'herbes de Provence'... évitent le moteur regex)
+        if not text_stripped or not text_stripped[0].isdigit():
+            return None, 'unité', text_stripped
+
+        match = _INGREDIENT_RE.match(text_stripped)
+        if not match:
+            # Pas de quantité en tête : juste le nom
+            return None, 'unité', text_stripped
+
+        quantity = float(match.group('qte').replace(',', '.'))
+        unit = match.group('masse') or match.group('cuillere') or match.group('contenant')
+        unit = unit.strip() if unit else 'unité'
+        return quantity, _UNIT_INTERN.get(unit, unit), match.group('nom').strip()
     
-    def _fallback_scraping(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _parse_ingredient_batch(self, texts: List[str]) -> List[tuple]:
+        """Parse une liste de textes d'ingrédients en une seule passe
+        finditer sur un blob joint par '\\n' : la boucle reste dans le
+        moteur regex C au lieu d'un appel Python par ingrédient.
+        Même sémantique, ligne à ligne, que _parse_ingredient_text"""
+        stripped = [(text or '').strip().replace('\n', ' ') for text in texts]
+        results: List[Optional[tuple]] = [None] * len(texts)
+
+        to_parse = []
+        for i, line in enumerate(stripped):
+            if not texts[i]:
+                results[i] = (None, None, texts[i])
+            elif not line or not line[0].isdigit():
+                results[i] = (None, 'unité', line)
+            else:
+                to_parse.append(i)
+
+        if to_parse:
+            # Position de début de chaque ligne dans le blob -> index source
+            line_starts = {}
+            pos = 0
+            for i in to_parse:
+                line_starts[pos] = i
+                pos += len(stripped[i]) + 1
+
+            blob = '\n'.join(stripped[i] for i in to_parse)
+            for match in _INGREDIENT_LINE_RE.finditer(blob):
+                i = line_starts.get(match.start())
+                if i is None:
+                    continue
+                quantity = float(match.group('qte').replace(',', '.'))
+                unit = match.group('masse') or match.group('cuillere') or match.group('contenant')
+                unit = unit.strip() if unit else 'unité'
+                results[i] = (quantity, _UNIT_INTERN.get(unit, unit),
+                              match.group('nom').strip())
+
+            # Lignes sans correspondance : même repli que le parse unitaire
+            for i in to_parse:
+                if results[i] is None:
+                    results[i] = (None, 'unité', stripped[i])
+
+        return results
+
+    def _fallback_scraping(self, query: str, limit: int) -> Sequence[Recipe]:
         """Scraping de fallback sur le site Jow"""
         try:
             # URL de recherche sur le site public Jow
@@ -162,9 +525,16 @@ class JowScraper:
             response = self.session.get(search_url, timeout=10)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                recipes = self._parse_html_recipes(soup, limit)
-                
+                # Parser le plus rapide disponible : selectolax (Lexbor),
+                # sinon XPath lxml direct, sinon BeautifulSoup
+                if SELECTOLAX_AVAILABLE:
+                    recipes = self._parse_html_recipes_selectolax(response.content, limit)
+                elif LXML_AVAILABLE:
+                    recipes = self._parse_html_recipes_lxml(response.content, limit)
+                else:
+                    soup = BeautifulSoup(response.content, _BS4_PARSER)
+                    recipes = self._parse_html_recipes(soup, limit)
+
                 if recipes:
                     logger.info(f"Scraping Jow réussi: {len(recipes)} recettes")
                     return recipes
@@ -176,7 +546,7 @@ class JowScraper:
             logger.error(f"Erreur scraping Jow: {e}")
             return self._get_realistic_recipes(query, limit)
     
-    def _parse_html_recipes(self, soup: BeautifulSoup, limit: int) -> List[Dict[str, Any]]:
+    def _parse_html_recipes(self, soup: BeautifulSoup, limit: int) -> List[Recipe]:
         """Parse les recettes depuis le HTML Jow"""
         recipes = []
         
@@ -198,17 +568,14 @@ class JowScraper:
                 url = link_elem.get('href', '') if link_elem else ''
                 
                 # Créer une recette basique
-                recipe = {
-                    'id': f"jow_scraped_{len(recipes)}",
-                    'name': name,
-                    'servings': 4,
-                    'prepTime': 30,
-                    'image': image,
-                    'ingredients': self._generate_realistic_ingredients(name),
-                    'source': 'jow',
-                    'url': url
-                }
-                
+                recipe = Recipe(
+                    id=f"jow_scraped_{len(recipes)}",
+                    name=name,
+                    image=image,
+                    ingredients=[Ingredient(**i) for i in self._generate_realistic_ingredients(name)],
+                    url=url,
+                )
+
                 recipes.append(recipe)
                 
             except Exception as e:
@@ -217,124 +584,134 @@ class JowScraper:
         
         return recipes
     
-    def _generate_realistic_ingredients(self, recipe_name: str) -> List[Dict[str, Any]]:
+    def _parse_html_recipes_selectolax(self, content: bytes, limit: int) -> List[Recipe]:
+        """Parse les recettes via selectolax (moteur Lexbor en C)
+
+        Même contrat de sortie que _parse_html_recipes.
+        """
+        recipes = []
+        tree = LexborHTMLParser(content)
+
+        for card in tree.css('div.recipe-card, div.recipe-item')[:limit]:
+            try:
+                # Extraire le nom
+                name_elem = card.css_first(
+                    'h2.recipe-title, h3.recipe-title, h4.recipe-title, '
+                    'h2.title, h3.title, h4.title'
+                )
+                name = name_elem.text(strip=True) if name_elem else "Recette Jow"
+
+                # Extraire l'image
+                img_elem = card.css_first('img')
+                image = (img_elem.attributes.get('src') or '') if img_elem else ''
+
+                # Extraire le lien
+                link_elem = card.css_first('a')
+                url = (link_elem.attributes.get('href') or '') if link_elem else ''
+
+                # Créer une recette basique
+                recipes.append(Recipe(
+                    id=f"jow_scraped_{len(recipes)}",
+                    name=name,
+                    image=image,
+                    ingredients=[Ingredient(**i) for i in self._generate_realistic_ingredients(name)],
+                    url=url,
+                ))
+
+            except Exception as e:
+                logger.error(f"Erreur parsing carte recette: {e}")
+                continue
+
+        return recipes
+
+    def _parse_html_recipes_lxml(self, content: bytes, limit: int) -> List[Recipe]:
+        """Parse les recettes en XPath lxml direct (moteur C, sans les
+        marches d'arbre Python de BS4)
+
+        Même contrat de sortie que _parse_html_recipes.
+        """
+        recipes = []
+        doc = lxml_html.fromstring(content)
+
+        cards = doc.xpath(
+            "//div[contains(@class, 'recipe-card') or contains(@class, 'recipe-item')]"
+        )[:limit]
+        for card in cards:
+            try:
+                # Extraire nom, image et lien en trois requêtes XPath
+                name = (card.xpath(
+                    ".//*[self::h2 or self::h3 or self::h4]"
+                    "[contains(@class, 'recipe-title') or contains(@class, 'title')]"
+                    "/text()"
+                ) or ['Recette Jow'])[0].strip() or 'Recette Jow'
+                image = (card.xpath('.//img/@src') or [''])[0]
+                url = (card.xpath('.//a/@href') or [''])[0]
+
+                # Créer une recette basique
+                recipes.append(Recipe(
+                    id=f"jow_scraped_{len(recipes)}",
+                    name=name,
+                    image=image,
+                    ingredients=[Ingredient(**i) for i in self._generate_realistic_ingredients(name)],
+                    url=url,
+                ))
+
+            except Exception as e:
+                logger.error(f"Erreur parsing carte recette: {e}")
+                continue
+
+        return recipes
+
+    def _generate_realistic_ingredients(self, recipe_name: str) -> Sequence[Dict[str, Any]]:
         """Génère des ingrédients réalistes basés sur le nom de la recette"""
         name_lower = recipe_name.lower()
-        
-        # Base d'ingrédients selon le type de recette
-        ingredients_db = {
-            'pâtes': [
-                {'name': 'pâtes', 'quantity': 400, 'unit': 'g'},
-                {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'},
-                {'name': 'ail', 'quantity': 2, 'unit': 'gousse'},
-                {'name': 'parmesan', 'quantity': 100, 'unit': 'g'}
-            ],
-            'carbonara': [
-                {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
-                {'name': 'lardons', 'quantity': 200, 'unit': 'g'},
-                {'name': 'œufs', 'quantity': 3, 'unit': 'unité'},
-                {'name': 'parmesan', 'quantity': 100, 'unit': 'g'},
-                {'name': 'poivre noir', 'quantity': 1, 'unit': 'pincée'}
-            ],
-            'bolognaise': [
-                {'name': 'pâtes', 'quantity': 500, 'unit': 'g'},
-                {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
-                {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
-                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                {'name': 'carotte', 'quantity': 1, 'unit': 'unité'}
-            ],
-            'poulet': [
-                {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
-                {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'}
-            ],
-            'salade': [
-                {'name': 'salade verte', 'quantity': 1, 'unit': 'unité'},
-                {'name': 'tomates cerises', 'quantity': 200, 'unit': 'g'},
-                {'name': 'concombre', 'quantity': 1, 'unit': 'unité'}
-            ]
-        }
-        
-        # Trouver la meilleure correspondance
-        for key, ingredients in ingredients_db.items():
+
+        # Correspondance exacte par token d'abord (hash O(1) par mot)
+        hit = set(name_lower.split()) & _INGREDIENTS_KEY_SET
+        if hit:
+            if len(hit) > 1:
+                # plusieurs tokens reconnus : garder la priorité du dictionnaire
+                for key in _INGREDIENTS_KEYS:
+                    if key in hit:
+                        return list(_INGREDIENTS_DB[key])
+            return list(_INGREDIENTS_DB[next(iter(hit))])
+
+        # Repli : balayage de sous-chaînes dans l'ordre du dictionnaire
+        for key in _INGREDIENTS_KEYS:
             if key in name_lower:
-                return ingredients
-        
-        # Ingrédients par défaut
-        return [
-            {'name': 'ingrédient principal', 'quantity': 1, 'unit': 'unité'},
-            {'name': 'huile d\'olive', 'quantity': 1, 'unit': 'cuillère à soupe'},
-            {'name': 'sel', 'quantity': 1, 'unit': 'pincée'},
-            {'name': 'poivre', 'quantity': 1, 'unit': 'pincée'}
-        ]
+                return list(_INGREDIENTS_DB[key])
+
+        # Gabarits par défaut figés : référence partagée, zéro allocation
+        return _DEFAULT_INGREDIENTS
     
-    def _get_realistic_recipes(self, query: str, limit: int) -> List[Dict[str, Any]]:
+    def _get_realistic_recipes(self, query: str, limit: int) -> Sequence[Recipe]:
         """Données réalistes en cas d'échec total"""
-        realistic_db = {
-            'pâtes': [
-                {
-                    'id': 'jow_realistic_carbonara',
-                    'name': 'Spaghetti Carbonara Authentique',
-                    'servings': 4,
-                    'prepTime': 20,
-                    'ingredients': [
-                        {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'lardons fumés', 'quantity': 150, 'unit': 'g'},
-                        {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
-                        {'name': 'parmesan râpé', 'quantity': 80, 'unit': 'g'},
-                        {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
-                    ],
-                    'source': 'jow'
-                },
-                {
-                    'id': 'jow_realistic_bolognaise',
-                    'name': 'Pâtes à la Bolognaise Maison',
-                    'servings': 6,
-                    'prepTime': 60,
-                    'ingredients': [
-                        {'name': 'tagliatelles', 'quantity': 500, 'unit': 'g'},
-                        {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'vin rouge', 'quantity': 100, 'unit': 'ml'}
-                    ],
-                    'source': 'jow'
-                }
-            ],
-            'poulet': [
-                {
-                    'id': 'jow_realistic_curry_poulet',
-                    'name': 'Curry de Poulet au Lait de Coco',
-                    'servings': 4,
-                    'prepTime': 35,
-                    'ingredients': [
-                        {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
-                        {'name': 'lait de coco', 'quantity': 400, 'unit': 'ml'},
-                        {'name': 'pâte de curry rouge', 'quantity': 2, 'unit': 'cuillère à soupe'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'poivron rouge', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'}
-                    ],
-                    'source': 'jow'
-                }
-            ]
-        }
-        
         query_lower = query.lower()
-        for category, recipes in realistic_db.items():
+
+        # Sonde O(1) : requête entière puis tokens, via l'index de mots-clés
+        category = _REALISTIC_KEYWORDS.get(query_lower)
+        if category is None:
+            for token in query_lower.split():
+                category = _REALISTIC_KEYWORDS.get(token)
+                if category is not None:
+                    break
+        if category is not None:
+            return _REALISTIC_DB[category][:limit]
+
+        # Repli historique : sous-chaîne dans le nom de catégorie
+        for category, recipes in _REALISTIC_DB.items():
             if query_lower in category:
                 return recipes[:limit]
         
         # Recette générique
-        return [{
-            'id': f'jow_realistic_{query}',
-            'name': f'Recette {query.title()}',
-            'servings': 4,
-            'prepTime': 30,
-            'ingredients': self._generate_realistic_ingredients(query),
-            'source': 'jow'
-        }]
+        return [Recipe(
+            id=f'jow_realistic_{query}',
+            name=f'Recette {query.title()}',
+            ingredients=[Ingredient(**i) for i in self._generate_realistic_ingredients(query)],
+        )]
 
-# Instance globale
-jow_scraper = JowScraper()
+@lru_cache(maxsize=1)
+def get_jow_scraper() -> JowScraper:
+    """Singleton paresseux : la Session, l'adapter et fake_useragent ne
+    sont construits qu'au premier vrai besoin, pas à l'import du module"""
+    return JowScraper()
@@ -10,56 +10,78 @@ import json
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+# NumPy optionnel pour l'agrégation vectorisée des gros lots
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Noms de mois indexés directement (plus rapide qu'un dict par appel)
+_MONTHS = ('janvier', 'février', 'mars', 'avril', 'mai', 'juin',
+           'juillet', 'août', 'septembre', 'octobre', 'novembre', 'décembre')
+
+# Normalisation des noms d'ingrédients en une seule passe regex
+_ACCENTS = {
+    'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
+    'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+    'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
+    'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
+    'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
+    'ç': 'c', 'ñ': 'n'
+}
+
+_VARIANTS = {
+    'pates': 'pâtes',
+    'pâtes': 'pâtes',
+    'spaghettis': 'pâtes',
+    'spaghetti': 'pâtes',
+    'tagliatelles': 'pâtes',
+    'penne': 'pâtes',
+    'fusilli': 'pâtes',
+    'macaroni': 'pâtes',
+    'tomates': 'tomate',
+    'pommes de terre': 'pomme de terre',
+    'patates': 'pomme de terre',
+    'oeufs': 'œuf',
+    'oignons': 'oignon'
+}
+
+# Les variantes les plus longues d'abord pour que 'spaghettis' gagne sur 'spaghetti'
+_NORM_RE = re.compile(
+    '(' + '|'.join(sorted(_VARIANTS, key=len, reverse=True)) + ')'
+    '|([' + ''.join(_ACCENTS) + '])'
+    r'|(\s+)'
+    r'|[^\w\s]'
+)
+
+
+def _norm_repl(match: 're.Match') -> str:
+    """Callback de substitution : variante canonique, accent simplifié,
+    espace unique ou suppression de la ponctuation selon le groupe touché."""
+    variant, accent, spaces = match.group(1, 2, 3)
+    if variant is not None:
+        return _VARIANTS[variant]
+    if accent is not None:
+        return _ACCENTS[accent]
+    return ' ' if spaces is not None else ''
+
 class IngredientManager:
     """Gestionnaire intelligent des ingrédients avec détection de doublons"""
-    
+
+    __slots__ = ('ingredients', 'recipes')
+
     def __init__(self):
         self.ingredients = {}
         self.recipes = {}
         
     def normalize_ingredient_name(self, name: str) -> str:
-        """Normalise le nom d'un ingrédient pour détecter les doublons"""
-        name = name.lower().strip()
-        
-        # Suppression des accents
-        accents = {
-            'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
-            'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
-            'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
-            'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
-            'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
-            'ç': 'c', 'ñ': 'n'
-        }
-        
-        for accent, normal in accents.items():
-            name = name.replace(accent, normal)
-        
-        # Suppression de la ponctuation et espaces multiples
-        name = re.sub(r'[^\w\s]', '', name)
-        name = re.sub(r'\s+', ' ', name)
-        
-        # Normalisation des variantes courantes
-        replacements = {
-            'pates': 'pâtes',
-            'spaghettis': 'pâtes',
-            'spaghetti': 'pâtes',
-            'tagliatelles': 'pâtes',
-            'penne': 'pâtes',
-            'fusilli': 'pâtes',
-            'macaroni': 'pâtes',
-            'tomates': 'tomate',
-            'pommes de terre': 'pomme de terre',
-            'patates': 'pomme de terre',
-            'oeufs': 'œuf',
-            'oignon': 'oignon',
-            'oignons': 'oignon'
-        }
-        
-        for variant, canonical in replacements.items():
-            if variant in name:
-                name = name.replace(variant, canonical)
-        
-        return name.strip()
+        """Normalise le nom d'un ingrédient pour détecter les doublons
+
+        Accents, ponctuation, espaces multiples et variantes courantes sont
+        traités en une seule passe regex au lieu de quatre parcours de chaîne.
+        """
+        return _NORM_RE.sub(_norm_repl, name.lower()).strip()
     
     def convert_to_standard_unit(self, quantity: float, unit: str) -> Dict[str, Any]:
         """Convertit les unités en unité standard"""
@@ -107,315 +129,396 @@ class IngredientManager:
         
         return {'quantity': quantity, 'unit': unit}
     
-    def add_ingredient(self, name: str, quantity: float, unit: str, recipe_id: str, recipe_name: str):
-        """Ajoute un ingrédient avec gestion intelligente des doublons"""
-        normalized_name = self.normalize_ingredient_name(name)
-        converted = self.convert_to_standard_unit(quantity, unit)
-        
-        if normalized_name not in self.ingredients:
-            self.ingredients[normalized_name] = {
+    def _ensure_ingredient(self, name: str, normalized_name: str, unit: str) -> Dict[str, Any]:
+        """Retourne l'entrée d'un ingrédient, en la créant si nécessaire"""
+        ingredient = self.ingredients.get(normalized_name)
+        if ingredient is None:
+            ingredient = self.ingredients[normalized_name] = {
                 'originalName': name,
                 'normalizedName': normalized_name,
                 'totalQuantity': 0,
-                'unit': converted['unit'],
+                'unit': unit,
                 'recipes': [],
+                'recipeNames': [],
                 'recipeCount': 0
             }
-        
-        ingredient = self.ingredients[normalized_name]
-        ingredient['totalQuantity'] += converted['quantity']
-        
-        # Ajouter la recette si pas déjà présente
-        recipe_info = {
-            'recipeId': recipe_id,
-            'recipeName': recipe_name,
-            'quantity': converted['quantity'],
-            'unit': converted['unit']
-        }
-        
-        # Vérifier si cette recette n'est pas déjà ajoutée
+        return ingredient
+
+    def _attach_recipe(self, ingredient: Dict[str, Any], recipe_id: str, recipe_name: str,
+                       quantity: float, unit: str):
+        """Rattache une recette à un ingrédient (cumul si déjà présente)"""
         if not any(r['recipeId'] == recipe_id for r in ingredient['recipes']):
-            ingredient['recipes'].append(recipe_info)
-            ingredient['recipeCount'] = len(ingredient['recipes'])
+            ingredient['recipes'].append({
+                'recipeId': recipe_id,
+                'recipeName': recipe_name,
+                'quantity': quantity,
+                'unit': unit
+            })
+            ingredient['recipeNames'].append(recipe_name)
+            ingredient['recipeCount'] += 1
         else:
             # Si la recette existe déjà, additionner les quantités
             for recipe in ingredient['recipes']:
                 if recipe['recipeId'] == recipe_id:
-                    recipe['quantity'] += converted['quantity']
+                    recipe['quantity'] += quantity
                     break
+
+    def add_ingredient(self, name: str, quantity: float, unit: str, recipe_id: str, recipe_name: str):
+        """Ajoute un ingrédient avec gestion intelligente des doublons"""
+        normalized_name = self.normalize_ingredient_name(name)
+        converted = self.convert_to_standard_unit(quantity, unit)
+
+        ingredient = self._ensure_ingredient(name, normalized_name, converted['unit'])
+        ingredient['totalQuantity'] += converted['quantity']
+        self._attach_recipe(ingredient, recipe_id, recipe_name,
+                            converted['quantity'], converted['unit'])
+
+    def add_ingredients_bulk(self, names: List[str], quantities: List[float], units: List[str],
+                             recipe_ids: List[str], recipe_names: List[str]):
+        """Ajoute un lot d'ingrédients en vectorisant l'agrégation des quantités
+
+        L'addition des quantités par ingrédient normalisé est faite en une
+        seule réduction NumPy (np.unique + np.bincount) quand NumPy est
+        disponible ; sinon on retombe sur add_ingredient par élément.
+        """
+        if not NUMPY_AVAILABLE or len(names) < 2:
+            for name, quantity, unit, recipe_id, recipe_name in zip(
+                    names, quantities, units, recipe_ids, recipe_names):
+                self.add_ingredient(name, quantity, unit, recipe_id, recipe_name)
+            return
+
+        normalized = [self.normalize_ingredient_name(name) for name in names]
+        converted = [self.convert_to_standard_unit(quantity, unit)
+                     for quantity, unit in zip(quantities, units)]
+
+        # Métadonnées en une passe légère, sans addition numérique par ligne
+        for name, norm, conv, recipe_id, recipe_name in zip(
+                names, normalized, converted, recipe_ids, recipe_names):
+            ingredient = self._ensure_ingredient(name, norm, conv['unit'])
+            self._attach_recipe(ingredient, recipe_id, recipe_name,
+                                conv['quantity'], conv['unit'])
+
+        # Agrégation numérique en une réduction C
+        qtys_std = np.array([conv['quantity'] for conv in converted], dtype=np.float64)
+        unique_names, inverse = np.unique(np.array(normalized, dtype=object),
+                                          return_inverse=True)
+        totals = np.bincount(inverse, weights=qtys_std)
+        for norm, total in zip(unique_names, totals):
+            self.ingredients[norm]['totalQuantity'] += float(total)
     
     def consolidate_shopping_list(self) -> Dict[str, Any]:
         """Génère la liste de courses consolidée"""
-        consolidated = {}
-        
-        for normalized_name, ingredient in self.ingredients.items():
-            recipe_names = [r['recipeName'] for r in ingredient['recipes']]
-            
-            consolidated[normalized_name] = {
+        return {
+            normalized_name: {
                 'name': ingredient['originalName'],
                 'quantity': round(ingredient['totalQuantity'], 2),
                 'unit': ingredient['unit'],
-                'recipeCount': ingredient['recipeCount'],
-                'recipes': recipe_names,
-                'isConsolidated': ingredient['recipeCount'] > 1,
-                'details': self._format_recipe_details(ingredient['recipeCount'], recipe_names)
+                'recipeCount': (rc := ingredient['recipeCount']),
+                'recipes': (rn := ingredient['recipeNames']),
+                'isConsolidated': rc > 1,
+                'details': (f"Présent dans {rc} recettes: {', '.join(rn)}" if rc > 1
+                            else (f"Recette: {rn[0]}" if rn else "Recette inconnue"))
             }
-        
-        return consolidated
-    
-    def _format_recipe_details(self, recipe_count: int, recipe_names: List[str]) -> str:
-        """Formate les détails des recettes pour l'affichage"""
-        if recipe_count > 1:
-            return f"Présent dans {recipe_count} recettes: {', '.join(recipe_names)}"
-        else:
-            return f"Recette: {recipe_names[0]}" if recipe_names else "Recette inconnue"
+            for normalized_name, ingredient in self.ingredients.items()
+        }
 
 class JowAPIIntegration:
     """Intégration avec l'API Jow"""
-    
+    # Base de données de recettes réalistes (référence partagée, indexée une fois)
+    recipes_database = {
+        'pâtes': [
+            {
+                'id': 'jow_pates_carbonara_1',
+                'name': 'Pâtes à la carbonara authentique',
+                'servings': 4,
+                'prepTime': 20,
+                'ingredients': [
+                    {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
+                    {'name': 'lardons fumés', 'quantity': 200, 'unit': 'g'},
+                    {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
+                    {'name': 'parmesan râpé', 'quantity': 100, 'unit': 'g'},
+                    {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
+                ],
+                'source': 'jow'
+            },
+            {
+                'id': 'jow_pates_bolognaise_1',
+                'name': 'Pâtes bolognaise traditionnelle',
+                'servings': 6,
+                'prepTime': 45,
+                'ingredients': [
+                    {'name': 'tagliatelles', 'quantity': 500, 'unit': 'g'},
+                    {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
+                    {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
+                    {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'vin rouge', 'quantity': 100, 'unit': 'ml'},
+                    {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'}
+                ],
+                'source': 'jow'
+            },
+            {
+                'id': 'jow_pates_pesto_1',
+                'name': 'Pâtes au pesto maison',
+                'servings': 4,
+                'prepTime': 15,
+                'ingredients': [
+                    {'name': 'penne', 'quantity': 400, 'unit': 'g'},
+                    {'name': 'basilic frais', 'quantity': 50, 'unit': 'g'},
+                    {'name': 'pignons de pin', 'quantity': 30, 'unit': 'g'},
+                    {'name': 'parmesan', 'quantity': 80, 'unit': 'g'},
+                    {'name': 'huile d\'olive', 'quantity': 80, 'unit': 'ml'},
+                    {'name': 'ail', 'quantity': 2, 'unit': 'gousse'}
+                ],
+                'source': 'jow'
+            }
+        ],
+        'poulet': [
+            {
+                'id': 'jow_poulet_curry_1',
+                'name': 'Curry de poulet au lait de coco',
+                'servings': 4,
+                'prepTime': 35,
+                'ingredients': [
+                    {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
+                    {'name': 'lait de coco', 'quantity': 400, 'unit': 'ml'},
+                    {'name': 'curry en poudre', 'quantity': 2, 'unit': 'cuillère à soupe'},
+                    {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'tomates cerises', 'quantity': 200, 'unit': 'g'},
+                    {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'},
+                    {'name': 'coriandre fraîche', 'quantity': 10, 'unit': 'g'}
+                ],
+                'source': 'jow'
+            },
+            {
+                'id': 'jow_poulet_roti_1',
+                'name': 'Poulet rôti aux légumes de saison',
+                'servings': 6,
+                'prepTime': 75,
+                'ingredients': [
+                    {'name': 'poulet entier', 'quantity': 1.5, 'unit': 'kg'},
+                    {'name': 'pommes de terre', 'quantity': 800, 'unit': 'g'},
+                    {'name': 'carottes', 'quantity': 400, 'unit': 'g'},
+                    {'name': 'thym frais', 'quantity': 3, 'unit': 'branche'},
+                    {'name': 'huile d\'olive', 'quantity': 3, 'unit': 'cuillère à soupe'},
+                    {'name': 'beurre', 'quantity': 30, 'unit': 'g'}
+                ],
+                'source': 'jow'
+            }
+        ],
+        'salade': [
+            {
+                'id': 'jow_salade_cesar_1',
+                'name': 'Salade César authentique',
+                'servings': 4,
+                'prepTime': 20,
+                'ingredients': [
+                    {'name': 'laitue romaine', 'quantity': 2, 'unit': 'unité'},
+                    {'name': 'blanc de poulet', 'quantity': 300, 'unit': 'g'},
+                    {'name': 'parmesan', 'quantity': 80, 'unit': 'g'},
+                    {'name': 'croutons', 'quantity': 100, 'unit': 'g'},
+                    {'name': 'anchois', 'quantity': 6, 'unit': 'filet'},
+                    {'name': 'mayonnaise', 'quantity': 4, 'unit': 'cuillère à soupe'},
+                    {'name': 'citron', 'quantity': 0.5, 'unit': 'unité'}
+                ],
+                'source': 'jow'
+            },
+            {
+                'id': 'jow_salade_quinoa_1',
+                'name': 'Salade de quinoa aux légumes frais',
+                'servings': 4,
+                'prepTime': 25,
+                'ingredients': [
+                    {'name': 'quinoa', 'quantity': 200, 'unit': 'g'},
+                    {'name': 'concombre', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'tomates cerises', 'quantity': 250, 'unit': 'g'},
+                    {'name': 'feta', 'quantity': 150, 'unit': 'g'},
+                    {'name': 'avocat', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'menthe fraîche', 'quantity': 10, 'unit': 'g'},
+                    {'name': 'huile d\'olive', 'quantity': 3, 'unit': 'cuillère à soupe'}
+                ],
+                'source': 'jow'
+            }
+        ],
+        'soupe': [
+            {
+                'id': 'jow_soupe_tomate_1',
+                'name': 'Soupe de tomates fraîches au basilic',
+                'servings': 4,
+                'prepTime': 30,
+                'ingredients': [
+                    {'name': 'tomates mûres', 'quantity': 1, 'unit': 'kg'},
+                    {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
+                    {'name': 'ail', 'quantity': 3, 'unit': 'gousse'},
+                    {'name': 'basilic frais', 'quantity': 20, 'unit': 'g'},
+                    {'name': 'bouillon de légumes', 'quantity': 500, 'unit': 'ml'},
+                    {'name': 'crème fraîche', 'quantity': 100, 'unit': 'ml'}
+                ],
+                'source': 'jow'
+            }
+        ],
+        'dessert': [
+            {
+                'id': 'jow_tiramisu_1',
+                'name': 'Tiramisu traditionnel italien',
+                'servings': 8,
+                'prepTime': 30,
+                'ingredients': [
+                    {'name': 'mascarpone', 'quantity': 500, 'unit': 'g'},
+                    {'name': 'œufs', 'quantity': 6, 'unit': 'unité'},
+                    {'name': 'sucre', 'quantity': 150, 'unit': 'g'},
+                    {'name': 'biscuits boudoirs', 'quantity': 300, 'unit': 'g'},
+                    {'name': 'café fort', 'quantity': 300, 'unit': 'ml'},
+                    {'name': 'cacao en poudre', 'quantity': 2, 'unit': 'cuillère à soupe'},
+                    {'name': 'amaretto', 'quantity': 50, 'unit': 'ml'}
+                ],
+                'source': 'jow'
+            }
+        ]
+    }
+
     def __init__(self, api_key: Optional[str] = None):
         self.api_key = api_key
         self.base_url = 'https://api.jow.fr'  # URL hypothétique
-        
+        self._build_indexes()
+
+    def _build_indexes(self):
+        """Construit les index de recherche (catégorie et tokens) une seule fois"""
+        self._cat_index: Dict[str, List[Dict[str, Any]]] = self.recipes_database
+        self._all_recipes: List[Dict[str, Any]] = [
+            recipe for category_recipes in self.recipes_database.values()
+            for recipe in category_recipes
+        ]
+
+        # Tokens des noms de recettes et des ingrédients -> indices de recettes
+        self._name_tokens: Dict[str, set] = {}
+        self._ingredient_tokens: Dict[str, set] = {}
+        for idx, recipe in enumerate(self._all_recipes):
+            for token in recipe['name'].lower().split():
+                self._name_tokens.setdefault(token, set()).add(idx)
+            for ingredient in recipe['ingredients']:
+                for token in ingredient['name'].lower().split():
+                    self._ingredient_tokens.setdefault(token, set()).add(idx)
+
     def search_recipes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche de recettes (version simulation réaliste)"""
-        # Base de données de recettes réalistes
-        recipes_database = {
-            'pâtes': [
-                {
-                    'id': 'jow_pates_carbonara_1',
-                    'name': 'Pâtes à la carbonara authentique',
-                    'servings': 4,
-                    'prepTime': 20,
-                    'ingredients': [
-                        {'name': 'spaghetti', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'lardons fumés', 'quantity': 200, 'unit': 'g'},
-                        {'name': 'œufs entiers', 'quantity': 3, 'unit': 'unité'},
-                        {'name': 'parmesan râpé', 'quantity': 100, 'unit': 'g'},
-                        {'name': 'poivre noir moulu', 'quantity': 1, 'unit': 'pincée'}
-                    ],
-                    'source': 'jow'
-                },
-                {
-                    'id': 'jow_pates_bolognaise_1',
-                    'name': 'Pâtes bolognaise traditionnelle',
-                    'servings': 6,
-                    'prepTime': 45,
-                    'ingredients': [
-                        {'name': 'tagliatelles', 'quantity': 500, 'unit': 'g'},
-                        {'name': 'bœuf haché', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'tomates pelées', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'carotte', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'vin rouge', 'quantity': 100, 'unit': 'ml'},
-                        {'name': 'huile d\'olive', 'quantity': 2, 'unit': 'cuillère à soupe'}
-                    ],
-                    'source': 'jow'
-                },
-                {
-                    'id': 'jow_pates_pesto_1',
-                    'name': 'Pâtes au pesto maison',
-                    'servings': 4,
-                    'prepTime': 15,
-                    'ingredients': [
-                        {'name': 'penne', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'basilic frais', 'quantity': 50, 'unit': 'g'},
-                        {'name': 'pignons de pin', 'quantity': 30, 'unit': 'g'},
-                        {'name': 'parmesan', 'quantity': 80, 'unit': 'g'},
-                        {'name': 'huile d\'olive', 'quantity': 80, 'unit': 'ml'},
-                        {'name': 'ail', 'quantity': 2, 'unit': 'gousse'}
-                    ],
-                    'source': 'jow'
-                }
-            ],
-            'poulet': [
-                {
-                    'id': 'jow_poulet_curry_1',
-                    'name': 'Curry de poulet au lait de coco',
-                    'servings': 4,
-                    'prepTime': 35,
-                    'ingredients': [
-                        {'name': 'blanc de poulet', 'quantity': 600, 'unit': 'g'},
-                        {'name': 'lait de coco', 'quantity': 400, 'unit': 'ml'},
-                        {'name': 'curry en poudre', 'quantity': 2, 'unit': 'cuillère à soupe'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'tomates cerises', 'quantity': 200, 'unit': 'g'},
-                        {'name': 'riz basmati', 'quantity': 300, 'unit': 'g'},
-                        {'name': 'coriandre fraîche', 'quantity': 10, 'unit': 'g'}
-                    ],
-                    'source': 'jow'
-                },
-                {
-                    'id': 'jow_poulet_roti_1',
-                    'name': 'Poulet rôti aux légumes de saison',
-                    'servings': 6,
-                    'prepTime': 75,
-                    'ingredients': [
-                        {'name': 'poulet entier', 'quantity': 1.5, 'unit': 'kg'},
-                        {'name': 'pommes de terre', 'quantity': 800, 'unit': 'g'},
-                        {'name': 'carottes', 'quantity': 400, 'unit': 'g'},
-                        {'name': 'thym frais', 'quantity': 3, 'unit': 'branche'},
-                        {'name': 'huile d\'olive', 'quantity': 3, 'unit': 'cuillère à soupe'},
-                        {'name': 'beurre', 'quantity': 30, 'unit': 'g'}
-                    ],
-                    'source': 'jow'
-                }
-            ],
-            'salade': [
-                {
-                    'id': 'jow_salade_cesar_1',
-                    'name': 'Salade César authentique',
-                    'servings': 4,
-                    'prepTime': 20,
-                    'ingredients': [
-                        {'name': 'laitue romaine', 'quantity': 2, 'unit': 'unité'},
-                        {'name': 'blanc de poulet', 'quantity': 300, 'unit': 'g'},
-                        {'name': 'parmesan', 'quantity': 80, 'unit': 'g'},
-                        {'name': 'croutons', 'quantity': 100, 'unit': 'g'},
-                        {'name': 'anchois', 'quantity': 6, 'unit': 'filet'},
-                        {'name': 'mayonnaise', 'quantity': 4, 'unit': 'cuillère à soupe'},
-                        {'name': 'citron', 'quantity': 0.5, 'unit': 'unité'}
-                    ],
-                    'source': 'jow'
-                },
-                {
-                    'id': 'jow_salade_quinoa_1',
-                    'name': 'Salade de quinoa aux légumes frais',
-                    'servings': 4,
-                    'prepTime': 25,
-                    'ingredients': [
-                        {'name': 'quinoa', 'quantity': 200, 'unit': 'g'},
-                        {'name': 'concombre', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'tomates cerises', 'quantity': 250, 'unit': 'g'},
-                        {'name': 'feta', 'quantity': 150, 'unit': 'g'},
-                        {'name': 'avocat', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'menthe fraîche', 'quantity': 10, 'unit': 'g'},
-                        {'name': 'huile d\'olive', 'quantity': 3, 'unit': 'cuillère à soupe'}
-                    ],
-                    'source': 'jow'
-                }
-            ],
-            'soupe': [
-                {
-                    'id': 'jow_soupe_tomate_1',
-                    'name': 'Soupe de tomates fraîches au basilic',
-                    'servings': 4,
-                    'prepTime': 30,
-                    'ingredients': [
-                        {'name': 'tomates mûres', 'quantity': 1, 'unit': 'kg'},
-                        {'name': 'oignon', 'quantity': 1, 'unit': 'unité'},
-                        {'name': 'ail', 'quantity': 3, 'unit': 'gousse'},
-                        {'name': 'basilic frais', 'quantity': 20, 'unit': 'g'},
-                        {'name': 'bouillon de légumes', 'quantity': 500, 'unit': 'ml'},
-                        {'name': 'crème fraîche', 'quantity': 100, 'unit': 'ml'}
-                    ],
-                    'source': 'jow'
-                }
-            ],
-            'dessert': [
-                {
-                    'id': 'jow_tiramisu_1',
-                    'name': 'Tiramisu traditionnel italien',
-                    'servings': 8,
-                    'prepTime': 30,
-                    'ingredients': [
-                        {'name': 'mascarpone', 'quantity': 500, 'unit': 'g'},
-                        {'name': 'œufs', 'quantity': 6, 'unit': 'unité'},
-                        {'name': 'sucre', 'quantity': 150, 'unit': 'g'},
-                        {'name': 'biscuits boudoirs', 'quantity': 300, 'unit': 'g'},
-                        {'name': 'café fort', 'quantity': 300, 'unit': 'ml'},
-                        {'name': 'cacao en poudre', 'quantity': 2, 'unit': 'cuillère à soupe'},
-                        {'name': 'amaretto', 'quantity': 50, 'unit': 'ml'}
-                    ],
-                    'source': 'jow'
-                }
-            ]
-        }
-        
-        # Recherche intelligente dans la base
-        results = []
+        # Accumulateur indexé par id : dédoublonnage O(1) et ordre
+        # d'insertion préservé (catégorie, puis nom, puis ingrédient)
+        acc: Dict[str, Dict[str, Any]] = {}
         query_lower = query.lower().strip()
-        
-        # Recherche directe par catégorie
-        for category, category_recipes in recipes_database.items():
-            if query_lower in category:
-                results.extend(category_recipes)
-        
-        # Recherche dans les noms de recettes
-        if not results:
-            for category_recipes in recipes_database.values():
-                for recipe in category_recipes:
-                    if query_lower in recipe['name'].lower():
-                        results.append(recipe)
-        
-        # Recherche dans les ingrédients
-        if not results:
-            for category_recipes in recipes_database.values():
-                for recipe in category_recipes:
-                    for ingredient in recipe['ingredients']:
-                        if query_lower in ingredient['name'].lower():
-                            if recipe not in results:
-                                results.append(recipe)
-                            break
-        
+        query_tokens = query_lower.split()
+
+        # Recherche directe par catégorie (index O(1), puis sous-chaîne)
+        category_recipes = self._cat_index.get(query_lower)
+        if category_recipes is None:
+            for category, recipes in self._cat_index.items():
+                if query_lower in category:
+                    category_recipes = recipes
+                    break
+        if category_recipes:
+            for recipe in category_recipes:
+                acc.setdefault(recipe['id'], recipe)
+
+        # Recherche dans les noms de recettes (index de tokens)
+        if not acc:
+            matched = set()
+            for token in query_tokens:
+                matched |= self._name_tokens.get(token, set())
+            for idx in sorted(matched):
+                recipe = self._all_recipes[idx]
+                acc.setdefault(recipe['id'], recipe)
+
+        # Recherche dans les ingrédients (index de tokens)
+        if not acc:
+            matched = set()
+            for token in query_tokens:
+                matched |= self._ingredient_tokens.get(token, set())
+            for idx in sorted(matched):
+                recipe = self._all_recipes[idx]
+                acc.setdefault(recipe['id'], recipe)
+
         # Si toujours pas de résultats, prendre quelques recettes populaires
-        if not results:
-            popular_recipes = []
-            for category_recipes in recipes_database.values():
-                popular_recipes.extend(category_recipes[:1])  # Une par catégorie
-            results = popular_recipes[:3]
-        
-        return results[:limit]
+        if not acc:
+            for category_recipes in self.recipes_database.values():
+                for recipe in category_recipes[:1]:  # Une par catégorie
+                    acc.setdefault(recipe['id'], recipe)
+                if len(acc) >= 3:
+                    break
+
+        return list(acc.values())[:limit]
+
+# Tables de suggestions immuables, construites une seule fois à l'import
+# (chaque instance du moteur n'en garde que des références)
+_SEASONAL_INGREDIENTS: Dict[int, frozenset] = {
+    month: frozenset(items) for month, items in {
+        1: ('chou', 'poireau', 'carotte', 'pomme', 'orange', 'endive', 'épinard'),
+        2: ('chou', 'endive', 'carotte', 'pomme', 'orange', 'brocoli', 'poireau'),
+        3: ('épinard', 'radis', 'carotte', 'pomme', 'asperge', 'artichaut'),
+        4: ('asperge', 'radis', 'épinard', 'fraise', 'petit pois', 'artichaut'),
+        5: ('asperge', 'radis', 'épinard', 'fraise', 'petit pois', 'artichaut', 'rhubarbe'),
+        6: ('tomate', 'courgette', 'aubergine', 'fraise', 'cerise', 'abricot', 'concombre'),
+        7: ('tomate', 'courgette', 'aubergine', 'pêche', 'abricot', 'melon', 'basilic'),
+        8: ('tomate', 'courgette', 'aubergine', 'pêche', 'melon', 'prune', 'maïs'),
+        9: ('potiron', 'champignon', 'raisin', 'pomme', 'poire', 'figue'),
+        10: ('potiron', 'champignon', 'châtaigne', 'pomme', 'poire', 'coing'),
+        11: ('chou', 'poireau', 'carotte', 'pomme', 'poire', 'clémentine', 'épinard'),
+        12: ('chou', 'poireau', 'carotte', 'pomme', 'orange', 'mandarine', 'endive')
+    }.items()
+}
+
+_NUTRITIONAL_ALTERNATIVES: Dict[str, tuple] = {
+    'pomme': ('poire', 'pêche', 'abricot', 'prune'),
+    'tomate': ('poivron rouge', 'aubergine', 'courgette'),
+    'carotte': ('betterave', 'panais', 'navet'),
+    'épinard': ('roquette', 'mâche', 'cresson', 'blette'),
+    'lait': ('lait d\'amande', 'lait de soja', 'lait d\'avoine'),
+    'beurre': ('huile olive', 'margarine', 'huile coco'),
+    'sucre': ('miel', 'sirop érable', 'sucre coco'),
+    'pâtes': ('riz', 'quinoa', 'boulgour'),
+    'bœuf': ('porc', 'agneau', 'dinde'),
+    'poulet': ('dinde', 'lapin', 'porc'),
+    'fromage': ('yaourt grec', 'ricotta', 'cottage cheese')
+}
+
+_PRICE_CATEGORIES: Dict[str, tuple] = {
+    'économique': ('marque distributeur', 'premiers prix', 'promotion'),
+    'moyen': ('marque nationale', 'qualité standard'),
+    'premium': ('bio', 'label rouge', 'artisanal', 'terroir')
+}
+
+
+def _build_category_members() -> Dict[str, frozenset]:
+    """Précalcule ingrédient -> membres de sa catégorie (pour l'intersection saisonnière)"""
+    categories = {
+        'légumes': ('tomate', 'carotte', 'courgette', 'aubergine', 'poivron', 'épinard', 'salade'),
+        'fruits': ('pomme', 'poire', 'orange', 'banane', 'fraise', 'pêche', 'abricot'),
+        'viandes': ('bœuf', 'porc', 'agneau', 'poulet', 'dinde'),
+        'poissons': ('saumon', 'thon', 'cabillaud', 'dorade'),
+        'céréales': ('riz', 'pâtes', 'blé', 'quinoa', 'avoine')
+    }
+    members = {}
+    for items in categories.values():
+        frozen = frozenset(items)
+        for item in items:
+            members[item] = frozen
+    return members
+
+
+_CATEGORY_MEMBERS: Dict[str, frozenset] = _build_category_members()
+
 
 class IntelligentSuggestionEngine:
     """Moteur de suggestions intelligentes"""
-    
+
+    __slots__ = ('seasonal_ingredients', 'nutritional_alternatives',
+                 'price_categories', '_category_members')
+
     def __init__(self):
-        self.seasonal_ingredients = self._init_seasonal_data()
-        self.nutritional_alternatives = self._init_nutritional_data()
-        self.price_categories = self._init_price_categories()
-        
-    def _init_seasonal_data(self) -> Dict[int, List[str]]:
-        """Initialise les données saisonnières par mois"""
-        return {
-            1: ['chou', 'poireau', 'carotte', 'pomme', 'orange', 'endive', 'épinard'],
-            2: ['chou', 'endive', 'carotte', 'pomme', 'orange', 'brocoli', 'poireau'],
-            3: ['épinard', 'radis', 'carotte', 'pomme', 'asperge', 'artichaut'],
-            4: ['asperge', 'radis', 'épinard', 'fraise', 'petit pois', 'artichaut'],
-            5: ['asperge', 'radis', 'épinard', 'fraise', 'petit pois', 'artichaut', 'rhubarbe'],
-            6: ['tomate', 'courgette', 'aubergine', 'fraise', 'cerise', 'abricot', 'concombre'],
-            7: ['tomate', 'courgette', 'aubergine', 'pêche', 'abricot', 'melon', 'basilic'],
-            8: ['tomate', 'courgette', 'aubergine', 'pêche', 'melon', 'prune', 'maïs'],
-            9: ['potiron', 'champignon', 'raisin', 'pomme', 'poire', 'figue'],
-            10: ['potiron', 'champignon', 'châtaigne', 'pomme', 'poire', 'coing'],
-            11: ['chou', 'poireau', 'carotte', 'pomme', 'poire', 'clémentine', 'épinard'],
-            12: ['chou', 'poireau', 'carotte', 'pomme', 'orange', 'mandarine', 'endive']
-        }
-    
-    def _init_nutritional_data(self) -> Dict[str, List[str]]:
-        """Initialise les alternatives nutritionnelles"""
-        return {
-            'pomme': ['poire', 'pêche', 'abricot', 'prune'],
-            'tomate': ['poivron rouge', 'aubergine', 'courgette'],
-            'carotte': ['betterave', 'panais', 'navet'],
-            'épinard': ['roquette', 'mâche', 'cresson', 'blette'],
-            'lait': ['lait d\'amande', 'lait de soja', 'lait d\'avoine'],
-            'beurre': ['huile olive', 'margarine', 'huile coco'],
-            'sucre': ['miel', 'sirop érable', 'sucre coco'],
-            'pâtes': ['riz', 'quinoa', 'boulgour'],
-            'bœuf': ['porc', 'agneau', 'dinde'],
-            'poulet': ['dinde', 'lapin', 'porc'],
-            'fromage': ['yaourt grec', 'ricotta', 'cottage cheese']
-        }
-    
-    def _init_price_categories(self) -> Dict[str, str]:
-        """Initialise les catégories de prix"""
-        return {
-            'économique': ['marque distributeur', 'premiers prix', 'promotion'],
-            'moyen': ['marque nationale', 'qualité standard'],
-            'premium': ['bio', 'label rouge', 'artisanal', 'terroir']
-        }
-    
+        self.seasonal_ingredients = _SEASONAL_INGREDIENTS
+        self.nutritional_alternatives = _NUTRITIONAL_ALTERNATIVES
+        self.price_categories = _PRICE_CATEGORIES
+        self._category_members = _CATEGORY_MEMBERS
+
     def generate_suggestions(self, ingredient: Dict[str, str], context: Dict[str, Any] = None) -> List[Dict[str, str]]:
         """Génère des suggestions intelligentes pour un ingrédient"""
         suggestions = []
@@ -423,36 +526,10 @@ class IntelligentSuggestionEngine:
         current_month = datetime.now().month
         context = context or {}
         
-        # Suggestions saisonnières
-        seasonal_items = self.seasonal_ingredients.get(current_month, [])
-        for item in seasonal_items:
-            if self._is_similar_ingredient(ingredient_name, item):
-                suggestions.append({
-                    'type': 'seasonal',
-                    'suggestion': item,
-                    'reason': f'Produit de saison ({self._get_month_name(current_month)})'
-                })
-        
-        # Suggestions nutritionnelles
-        for base_ingredient, alternatives in self.nutritional_alternatives.items():
-            if base_ingredient in ingredient_name or ingredient_name in base_ingredient:
-                for alt in alternatives[:2]:  # Limiter à 2 alternatives
-                    suggestions.append({
-                        'type': 'nutritional',
-                        'suggestion': alt,
-                        'reason': f'Alternative nutritionnelle à {base_ingredient}'
-                    })
-        
-        # Suggestions économiques
-        budget = context.get('budget', 'moyen')
-        if budget == 'économique':
-            suggestions.append({
-                'type': 'economic',
-                'suggestion': f'{ingredient_name} marque distributeur',
-                'reason': 'Option économique (30-40% moins cher)'
-            })
-        
-        # Suggestions selon les préférences
+        # Branches ordonnées du moins cher au plus cher à calculer, avec
+        # sortie anticipée dès que les 5 suggestions sont remplies
+
+        # Suggestions selon les préférences (simples tests d'appartenance)
         preferences = context.get('preferences', [])
         if 'bio' in preferences:
             suggestions.append({
@@ -460,41 +537,59 @@ class IntelligentSuggestionEngine:
                 'suggestion': f'{ingredient_name} bio',
                 'reason': 'Version bio selon vos préférences'
             })
-        
+
         if 'local' in preferences:
             suggestions.append({
                 'type': 'preference',
                 'suggestion': f'{ingredient_name} local',
                 'reason': 'Produit local selon vos préférences'
             })
-        
-        return suggestions[:5]  # Limiter à 5 suggestions
+
+        # Suggestions économiques
+        budget = context.get('budget', 'moyen')
+        if budget == 'économique':
+            suggestions.append({
+                'type': 'economic',
+                'suggestion': f'{ingredient_name} marque distributeur',
+                'reason': 'Option économique (30-40% moins cher)'
+            })
+
+        if len(suggestions) >= 5:
+            return suggestions[:5]
+
+        # Suggestions saisonnières (intersection d'ensembles, une seule opération C)
+        seasonal_items = self.seasonal_ingredients.get(current_month, frozenset())
+        similar = self._category_members.get(ingredient_name, frozenset())
+        for item in sorted(seasonal_items & similar):
+            suggestions.append({
+                'type': 'seasonal',
+                'suggestion': item,
+                'reason': f'Produit de saison ({self._get_month_name(current_month)})'
+            })
+            if len(suggestions) >= 5:
+                return suggestions
+
+        # Suggestions nutritionnelles (balayage complet de la table, en dernier)
+        for base_ingredient, alternatives in self.nutritional_alternatives.items():
+            if base_ingredient in ingredient_name or ingredient_name in base_ingredient:
+                for alt in alternatives[:2]:  # Limiter à 2 alternatives
+                    suggestions.append({
+                        'type': 'nutritional',
+                        'suggestion': alt,
+                        'reason': f'Alternative nutritionnelle à {base_ingredient}'
+                    })
+                    if len(suggestions) >= 5:
+                        return suggestions
+
+        return suggestions
     
     def _is_similar_ingredient(self, ingredient1: str, ingredient2: str) -> bool:
-        """Vérifie si deux ingrédients sont similaires"""
-        # Catégories d'ingrédients similaires
-        categories = {
-            'légumes': ['tomate', 'carotte', 'courgette', 'aubergine', 'poivron', 'épinard', 'salade'],
-            'fruits': ['pomme', 'poire', 'orange', 'banane', 'fraise', 'pêche', 'abricot'],
-            'viandes': ['bœuf', 'porc', 'agneau', 'poulet', 'dinde'],
-            'poissons': ['saumon', 'thon', 'cabillaud', 'dorade'],
-            'céréales': ['riz', 'pâtes', 'blé', 'quinoa', 'avoine']
-        }
-        
-        for category_items in categories.values():
-            if ingredient1 in category_items and ingredient2 in category_items:
-                return True
-        
-        return False
+        """Vérifie si deux ingrédients sont similaires (même catégorie)"""
+        return ingredient2 in self._category_members.get(ingredient1, frozenset())
     
     def _get_month_name(self, month: int) -> str:
         """Retourne le nom du mois"""
-        months = {
-            1: 'janvier', 2: 'février', 3: 'mars', 4: 'avril',
-            5: 'mai', 6: 'juin', 7: 'juillet', 8: 'août',
-            9: 'septembre', 10: 'octobre', 11: 'novembre', 12: 'décembre'
-        }
-        return months.get(month, 'mois inconnu')
+        return _MONTHS[month - 1] if 1 <= month <= 12 else 'mois inconnu'
 
 def test_intelligent_system():
     """Fonction de test du système intelligent"""
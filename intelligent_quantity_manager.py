@@ -7,11 +7,271 @@ Remplace smart_shopping_intelligent.py
 """
 
 import re
+import sys
 import json
 import sqlite3
+import threading
+import contextlib
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Tuple
-from difflib import SequenceMatcher
+from difflib import get_close_matches
+
+# Automate multi-motifs optionnel pour la recherche d'alias
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Table d'accents et regex de nettoyage construites une fois à l'import.
+# Une seule passe remplace chaque série de caractères non alphanumériques
+# (ponctuation comme espaces) par un espace unique
+_ACCENT_TABLE = str.maketrans('àáâãäåèéêëìíîïòóôõöùúûüçñ', 'aaaaaaeeeeiiiiooooouuuucn')
+_NONWORD_RE = re.compile(r'[^\w]+')
+
+
+def _basic_normalize(name: str) -> str:
+    """Nettoyage sans application d'alias : minuscules, accents, ponctuation"""
+    normalized = name.lower().strip()
+    normalized = normalized.translate(_ACCENT_TABLE)
+    return _NONWORD_RE.sub(' ', normalized).strip()
+
+# Tables de conversion et d'alias construites une seule fois à l'import :
+# chaque instance ne fait que les référencer
+_UNIT_CONVERSIONS = {
+    # Poids vers grammes
+    'g': {'g': 1, 'kg': 0.001, 'mg': 1000},
+    'kg': {'g': 1000, 'kg': 1, 'mg': 1000000},
+    'mg': {'g': 0.001, 'kg': 0.000001, 'mg': 1},
+
+    # Volume vers millilitres
+    'ml': {'ml': 1, 'l': 0.001, 'cl': 0.1, 'dl': 0.01},
+    'l': {'ml': 1000, 'l': 1, 'cl': 100, 'dl': 10},
+    'cl': {'ml': 10, 'l': 0.01, 'cl': 1, 'dl': 0.1},
+    'dl': {'ml': 100, 'l': 0.1, 'cl': 10, 'dl': 1},
+
+    # Mesures cuisine vers ml
+    'cuillère à soupe': {'ml': 15},
+    'cuillère à café': {'ml': 5},
+    'c. à soupe': {'ml': 15},
+    'c. à café': {'ml': 5},
+    'tasse': {'ml': 250},
+    'verre': {'ml': 200},
+
+    # Unités restent en unités
+    'unité': {'unité': 1, 'pièce': 1, 'tranche': 1},
+    'pièce': {'unité': 1, 'pièce': 1, 'tranche': 1},
+    'tranche': {'unité': 1, 'pièce': 1, 'tranche': 1},
+    'gousse': {'unité': 1, 'gousse': 1},
+    'branche': {'unité': 1, 'branche': 1},
+    'pincée': {'pincée': 1}
+}
+
+# Alias d'ingrédients pour détecter les doublons (figés à l'import pour
+# que la normalisation puisse être mémoïsée)
+_INGREDIENT_ALIASES = {
+    # Pâtes
+    'spaghetti': 'pâtes',
+    'spaghettis': 'pâtes',
+    'tagliatelles': 'pâtes',
+    'penne': 'pâtes',
+    'fusilli': 'pâtes',
+    'linguine': 'pâtes',
+    'macaroni': 'pâtes',
+    'pasta': 'pâtes',
+
+    # Légumes
+    'tomate': 'tomates',
+    'tomates cerises': 'tomates',
+    'oignon': 'oignons',
+    'oignon rouge': 'oignons',
+    'oignon blanc': 'oignons',
+    'échalote': 'oignons',
+    'pomme de terre': 'pommes de terre',
+    'patate': 'pommes de terre',
+
+    # Produits laitiers
+    'lait entier': 'lait',
+    'lait demi-écrémé': 'lait',
+    'lait écrémé': 'lait',
+    'crème fraîche': 'crème',
+    'crème liquide': 'crème',
+
+    # Viandes
+    'blanc de poulet': 'poulet',
+    'cuisse de poulet': 'poulet',
+    'escalope de poulet': 'poulet',
+    'bœuf haché': 'bœuf',
+    'steak haché': 'bœuf',
+
+    # Fromages
+    'parmesan râpé': 'parmesan',
+    'gruyère râpé': 'gruyère',
+    'emmental râpé': 'emmental'
+}
+
+# Clés d'alias passées par le nettoyage de base : 'échalote' (clé brute)
+# ne correspondrait jamais à 'echalote' (entrée normalisée sans accents)
+_NORMALIZED_ALIASES = {}
+for _alias, _canonical in _INGREDIENT_ALIASES.items():
+    _NORMALIZED_ALIASES.setdefault(_basic_normalize(_alias), _canonical)
+
+# Alias triés par longueur décroissante pour le repli sans automate
+_ALIASES_BY_LENGTH = sorted(_NORMALIZED_ALIASES.items(),
+                            key=lambda kv: len(kv[0]), reverse=True)
+
+if AHOCORASICK_AVAILABLE:
+    _ALIAS_AUTOMATON = ahocorasick.Automaton()
+    for _alias, _canonical in _NORMALIZED_ALIASES.items():
+        _ALIAS_AUTOMATON.add_word(_alias, (_alias, _canonical))
+    _ALIAS_AUTOMATON.make_automaton()
+else:
+    _ALIAS_AUTOMATON = None
+
+
+def _apply_aliases(normalized: str) -> str:
+    """Applique les alias : table exacte puis recherche de sous-chaînes
+
+    Une correspondance exacte gagne toujours ; sinon l'automate (ou le
+    repli trié) prend l'alias le plus long contenu dans le nom, ce qui
+    évite les faux positifs du test symétrique « nom dans alias ».
+    """
+    exact = _NORMALIZED_ALIASES.get(normalized)
+    if exact is not None:
+        return exact
+
+    if _ALIAS_AUTOMATON is not None:
+        # Une seule passe O(len(nom)) sur tous les alias à la fois
+        best = None
+        for _end, (alias, canonical) in _ALIAS_AUTOMATON.iter(normalized):
+            if best is None or len(alias) > len(best[0]):
+                best = (alias, canonical)
+        if best is not None:
+            return best[1]
+        return normalized
+
+    for alias, canonical in _ALIASES_BY_LENGTH:
+        if alias in normalized:
+            return canonical
+    return normalized
+
+
+# Seuils de changement d'unité pour l'affichage : (seuil, unité cible).
+# Vers le haut dès que le seuil est atteint, vers le bas sous 1 pour les
+# unités larges (0.5 l s'affiche mieux en 500 ml)
+_UP_RULES = {'g': (1000, 'kg'), 'ml': (1000, 'l'), 'mg': (1000, 'g')}
+_DOWN_RULES = {'kg': (1000, 'g'), 'l': (1000, 'ml')}
+
+# Colonnes réellement consommées par la consolidation : éviter SELECT *
+# réduit les octets transférés par ligne et fige l'ordre des colonnes.
+# Les valeurs par défaut sont résolues par COALESCE côté SQLite, le code
+# Python reçoit directement des valeurs exploitables
+_ITEM_COLUMNS = ('id, name, quantity, '
+                 "COALESCE(quantity_decimal, CAST(quantity AS REAL), 1) AS quantity_decimal, "
+                 "COALESCE(unit, 'unité') AS unit, recipe_sources")
+
+# Requêtes de lecture figées à l'import : les f-strings ne sont évaluées
+# qu'une fois, chaque execute() retombe donc sur le même texte SQL et le
+# cache de requêtes préparées de sqlite3 reste chaud
+_SQL_SELECT_EXACT = f'''
+    SELECT {_ITEM_COLUMNS} FROM shopping_list
+    WHERE checked = 0 AND name_norm = ?
+    LIMIT 1
+'''
+
+_SQL_SELECT_CANDIDATES = f'''
+    SELECT {_ITEM_COLUMNS} FROM shopping_list
+    WHERE checked = 0
+      AND (name_norm IS NULL OR substr(name_norm, 1, 2) = substr(?, 1, 2))
+    ORDER BY name
+'''
+
+_SQL_SELECT_UNCHECKED = f'''
+    SELECT {_ITEM_COLUMNS} FROM shopping_list
+    WHERE checked = 0
+    ORDER BY name
+'''
+
+_SQL_SELECT_ITEM_UNIT = '''
+    SELECT id, COALESCE(unit, 'unité') AS unit
+    FROM shopping_list WHERE id = ?
+'''
+
+_SQL_UPDATE_QTY = '''
+    UPDATE shopping_list
+    SET quantity = ?, quantity_decimal = ?, unit = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+# Requêtes d'écriture préparées une fois au chargement du module : les
+# chemins unitaire et par lot partagent les mêmes textes SQL, donc SQLite
+# réutilise ses requêtes compilées
+_SQL_INSERT_ITEM = '''
+    INSERT INTO shopping_list
+    (name, name_norm, category, quantity, quantity_decimal, unit, recipe_sources, checked, created_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP)
+    ON CONFLICT(name_norm) WHERE checked = 0 AND name_norm IS NOT NULL
+    DO UPDATE SET
+        quantity_decimal = quantity_decimal + excluded.quantity_decimal,
+        quantity = CAST(quantity_decimal + excluded.quantity_decimal AS INTEGER),
+        recipe_sources = COALESCE(recipe_sources, '') || ', ' || excluded.recipe_sources,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+# Variante en un seul statement : toutes les créations d'un lot partent
+# dans un blob JSON que SQLite déroule via json_each (json_extract plutôt
+# que ->> pour rester compatible avec les SQLite plus anciens du Pi)
+_SQL_INSERT_FROM_JSON = '''
+    INSERT INTO shopping_list
+    (name, name_norm, category, quantity, quantity_decimal, unit, recipe_sources, checked, created_at)
+    SELECT json_extract(value, '$.name'), json_extract(value, '$.norm'),
+           'Recettes', json_extract(value, '$.qty_int'),
+           json_extract(value, '$.qty'), json_extract(value, '$.unit'),
+           json_extract(value, '$.src'), 0, CURRENT_TIMESTAMP
+    FROM json_each(?)
+    ON CONFLICT(name_norm) WHERE checked = 0 AND name_norm IS NOT NULL
+    DO UPDATE SET
+        quantity_decimal = quantity_decimal + excluded.quantity_decimal,
+        quantity = CAST(quantity_decimal + excluded.quantity_decimal AS INTEGER),
+        recipe_sources = COALESCE(recipe_sources, '') || ', ' || excluded.recipe_sources,
+        updated_at = CURRENT_TIMESTAMP
+'''
+
+_SQL_CONSOLIDATE = '''
+    UPDATE shopping_list
+    SET quantity = ?, quantity_decimal = ?, unit = ?,
+        recipe_sources = COALESCE(recipe_sources, '') || ?,
+        updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+# Ajoute la quantité inconvertible en note sur
+# le nom (', x u' si une note existe déjà, ' (+ x u)' sinon)
+_SQL_APPEND_NOTE = '''
+    UPDATE shopping_list
+    SET name = CASE
+        WHEN name LIKE '%+%' THEN name || ?
+        ELSE name || ?
+    END,
+    recipe_sources = COALESCE(recipe_sources, '') || ?,
+    updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+'''
+
+
+@lru_cache(maxsize=256)
+def _norm_unit(unit: str) -> str:
+    """Nettoyage mémoïsé d'une unité (peu de valeurs distinctes)"""
+    return unit.lower().strip()
+
+
+@lru_cache(maxsize=4096)
+def _normalize_name(name: str) -> str:
+    """Normalisation mémoïsée : les mêmes noms reviennent à chaque recette"""
+    # Nettoyage de base, puis alias ; le résultat est interné pour que les
+    # comparaisons d'égalité en aval se réduisent à un test de pointeur
+    return sys.intern(_apply_aliases(_basic_normalize(name)))
 
 class AdvancedIngredientManager:
     """Gestionnaire avancé avec gestion intelligente des quantités"""
@@ -21,203 +281,172 @@ class AdvancedIngredientManager:
         self.similarity_threshold = 0.85
         self.unit_conversions = self._init_unit_conversions()
         self.ingredient_aliases = self._init_ingredient_aliases()
+        self._conv = self._build_conversion_closure()
+        # Cache par instance : mémoïse aussi le lower/strip des unités
+        self._conversion_factor = lru_cache(maxsize=256)(self._compute_conversion_factor)
+
+        # Connexion unique réutilisée (évite un connect + fsync par appel),
+        # protégée par un verrou réentrant pour les accès multi-threads
+        self._lock = threading.RLock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False,
+                                    isolation_level=None,
+                                    cached_statements=256)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.execute('PRAGMA temp_store=MEMORY')
+        self.conn.execute('PRAGMA cache_size=-20000')
         
     def _init_unit_conversions(self) -> Dict[str, Dict[str, float]]:
         """Initialise les conversions d'unités"""
-        return {
-            # Poids vers grammes
-            'g': {'g': 1, 'kg': 0.001, 'mg': 1000},
-            'kg': {'g': 1000, 'kg': 1, 'mg': 1000000},
-            'mg': {'g': 0.001, 'kg': 0.000001, 'mg': 1},
-            
-            # Volume vers millilitres
-            'ml': {'ml': 1, 'l': 0.001, 'cl': 0.1, 'dl': 0.01},
-            'l': {'ml': 1000, 'l': 1, 'cl': 100, 'dl': 10},
-            'cl': {'ml': 10, 'l': 0.01, 'cl': 1, 'dl': 0.1},
-            'dl': {'ml': 100, 'l': 0.1, 'cl': 10, 'dl': 1},
-            
-            # Mesures cuisine vers ml
-            'cuillère à soupe': {'ml': 15},
-            'cuillère à café': {'ml': 5},
-            'c. à soupe': {'ml': 15},
-            'c. à café': {'ml': 5},
-            'tasse': {'ml': 250},
-            'verre': {'ml': 200},
-            
-            # Unités restent en unités
-            'unité': {'unité': 1, 'pièce': 1, 'tranche': 1},
-            'pièce': {'unité': 1, 'pièce': 1, 'tranche': 1},
-            'tranche': {'unité': 1, 'pièce': 1, 'tranche': 1},
-            'gousse': {'unité': 1, 'gousse': 1},
-            'branche': {'unité': 1, 'branche': 1},
-            'pincée': {'pincée': 1}
-        }
-    
+        return _UNIT_CONVERSIONS
+
     def _init_ingredient_aliases(self) -> Dict[str, str]:
-        """Initialise les alias d'ingrédients pour détecter les doublons"""
-        return {
-            # Pâtes
-            'spaghetti': 'pâtes',
-            'spaghettis': 'pâtes',
-            'tagliatelles': 'pâtes',
-            'penne': 'pâtes',
-            'fusilli': 'pâtes',
-            'linguine': 'pâtes',
-            'macaroni': 'pâtes',
-            'pasta': 'pâtes',
-            
-            # Légumes
-            'tomate': 'tomates',
-            'tomates cerises': 'tomates',
-            'oignon': 'oignons',
-            'oignon rouge': 'oignons',
-            'oignon blanc': 'oignons',
-            'échalote': 'oignons',
-            'pomme de terre': 'pommes de terre',
-            'patate': 'pommes de terre',
-            
-            # Produits laitiers
-            'lait entier': 'lait',
-            'lait demi-écrémé': 'lait',
-            'lait écrémé': 'lait',
-            'crème fraîche': 'crème',
-            'crème liquide': 'crème',
-            
-            # Viandes
-            'blanc de poulet': 'poulet',
-            'cuisse de poulet': 'poulet',
-            'escalope de poulet': 'poulet',
-            'bœuf haché': 'bœuf',
-            'steak haché': 'bœuf',
-            
-            # Fromages
-            'parmesan râpé': 'parmesan',
-            'gruyère râpé': 'gruyère',
-            'emmental râpé': 'emmental'
-        }
-    
+        """Initialise les alias d'ingrédients (clés déjà normalisées)"""
+        return _NORMALIZED_ALIASES
+
     def normalize_ingredient_name(self, name: str) -> str:
         """Normalise le nom d'un ingrédient pour détecter les similitudes"""
-        # Nettoyage basique
-        normalized = name.lower().strip()
-        
-        # Suppression des accents
-        accents = {
-            'à': 'a', 'á': 'a', 'â': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
-            'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
-            'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
-            'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o', 'ö': 'o',
-            'ù': 'u', 'ú': 'u', 'û': 'u', 'ü': 'u',
-            'ç': 'c', 'ñ': 'n'
-        }
-        
-        for accent, normal in accents.items():
-            normalized = normalized.replace(accent, normal)
-        
-        # Suppression de la ponctuation
-        normalized = re.sub(r'[^\w\s]', ' ', normalized)
-        normalized = re.sub(r'\s+', ' ', normalized).strip()
-        
-        # Application des alias
-        for alias, canonical in self.ingredient_aliases.items():
-            if alias in normalized or normalized in alias:
-                normalized = canonical
-                break
-        
-        return normalized
+        return _normalize_name(name)
     
     def find_similar_ingredient(self, name: str, existing_ingredients: List[Dict]) -> Optional[Dict]:
         """Trouve un ingrédient similaire dans la liste existante"""
         normalized_name = self.normalize_ingredient_name(name)
-        
+
+        # Normaliser la liste une seule fois, indexée par nom normalisé
+        by_norm = {}
         for existing in existing_ingredients:
-            existing_normalized = self.normalize_ingredient_name(existing['name'])
-            
-            # Correspondance exacte
-            if normalized_name == existing_normalized:
-                return existing
-            
-            # Correspondance par similarité
-            similarity = SequenceMatcher(None, normalized_name, existing_normalized).ratio()
-            if similarity >= self.similarity_threshold:
-                return existing
-            
-            # Correspondance si l'un contient l'autre
-            if (normalized_name in existing_normalized or 
-                existing_normalized in normalized_name) and len(normalized_name) > 3:
-                return existing
-        
+            by_norm.setdefault(self.normalize_ingredient_name(existing['name']), existing)
+
+        return self._find_similar_in_index(normalized_name, by_norm)
+
+    def _find_similar_in_index(self, normalized_name: str, norm_index: Dict[str, Dict]) -> Optional[Dict]:
+        """Recherche dans un index nom normalisé -> article déjà construit"""
+        # Correspondance exacte
+        exact = norm_index.get(normalized_name)
+        if exact is not None:
+            return exact
+
+        # Correspondance par similarité : get_close_matches élague la
+        # plupart des candidats via quick_ratio avant le ratio complet
+        matches = get_close_matches(normalized_name, norm_index,
+                                    n=1, cutoff=self.similarity_threshold)
+        if matches:
+            return norm_index[matches[0]]
+
+        # Correspondance si l'un contient l'autre
+        if len(normalized_name) > 3:
+            for existing_normalized, existing in norm_index.items():
+                if (normalized_name in existing_normalized or
+                        existing_normalized in normalized_name):
+                    return existing
+
         return None
     
+    def _build_conversion_closure(self) -> Dict[Tuple[str, str], float]:
+        """Aplatie la table de conversions en facteurs (de, vers) -> facteur
+
+        Les conversions indirectes (ex: cuillère à soupe -> ml -> l) sont
+        précalculées une fois ici au lieu d'être recherchées à chaque appel.
+        """
+        conv = {}
+        for from_unit, targets in self.unit_conversions.items():
+            conv[(from_unit, from_unit)] = 1.0
+            for to_unit, factor in targets.items():
+                conv[(from_unit, to_unit)] = float(factor)
+
+        # Fermeture à deux sauts via une unité intermédiaire
+        direct = list(conv.items())
+        for (a, b), f1 in direct:
+            for (c, d), f2 in direct:
+                if b == c and (a, d) not in conv:
+                    conv[(a, d)] = f1 * f2
+
+        return conv
+
+    def _compute_conversion_factor(self, from_unit: str, to_unit: str) -> Optional[float]:
+        """Retourne le facteur de conversion entre deux unités, ou None"""
+        from_unit = _norm_unit(from_unit)
+        to_unit = _norm_unit(to_unit)
+
+        if from_unit == to_unit:
+            return 1.0
+
+        return self._conv.get((from_unit, to_unit))
+
     def convert_units(self, quantity: float, from_unit: str, to_unit: str) -> Optional[float]:
         """Convertit une quantité d'une unité vers une autre"""
-        from_unit = from_unit.lower().strip()
-        to_unit = to_unit.lower().strip()
-        
+        # Cas très fréquent : mêmes chaînes déjà propres, rien à convertir
         if from_unit == to_unit:
             return quantity
-        
-        # Chercher la conversion directe
-        if from_unit in self.unit_conversions:
-            conversions = self.unit_conversions[from_unit]
-            if to_unit in conversions:
-                return quantity * conversions[to_unit]
-        
-        # Chercher via une unité intermédiaire (ex: cuillère à soupe -> ml -> l)
-        for intermediate_unit, from_conversions in self.unit_conversions.items():
-            if (from_unit in from_conversions and 
-                intermediate_unit in self.unit_conversions and 
-                to_unit in self.unit_conversions[intermediate_unit]):
-                
-                # Conversion en deux étapes
-                intermediate_quantity = quantity * from_conversions[from_unit]
-                return intermediate_quantity * self.unit_conversions[intermediate_unit][to_unit]
-        
-        return None  # Conversion impossible
+        if quantity == 0:
+            return 0.0
+
+        factor = self._conversion_factor(from_unit, to_unit)
+        if factor is None:
+            return None  # Conversion impossible
+        return quantity * factor
     
     def get_best_unit(self, quantity: float, current_unit: str) -> Tuple[float, str]:
         """Retourne la meilleure unité pour afficher une quantité"""
-        current_unit = current_unit.lower().strip()
-        
-        # Règles d'optimisation d'affichage
-        if current_unit == 'g':
-            if quantity >= 1000:
-                return quantity / 1000, 'kg'
-        elif current_unit == 'ml':
-            if quantity >= 1000:
-                return quantity / 1000, 'l'
-        elif current_unit == 'mg':
-            if quantity >= 1000:
-                return quantity / 1000, 'g'
-        
+        quantity = float(quantity)
+        current_unit = _norm_unit(current_unit)
+
+        # Règles d'optimisation d'affichage : une recherche de dict au
+        # lieu d'une chaîne de comparaisons, extensible par les tables
+        rule = _UP_RULES.get(current_unit)
+        if rule is not None and quantity >= rule[0]:
+            return quantity / rule[0], rule[1]
+
+        rule = _DOWN_RULES.get(current_unit)
+        if rule is not None and 0 < quantity < 1:
+            return quantity * rule[0], rule[1]
+
         return quantity, current_unit
     
     def add_or_update_item(self, name: str, quantity: float, unit: str, 
                           category: str = 'Recettes', recipe_source: str = None) -> Dict[str, Any]:
         """Ajoute ou met à jour un article avec gestion intelligente des quantités"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                # Récupérer les articles existants non cochés
-                cursor.execute('''
-                    SELECT * FROM shopping_list 
-                    WHERE checked = 0
-                    ORDER BY name
-                ''')
-                existing_items = [dict(row) for row in cursor.fetchall()]
-                
-                # Chercher un article similaire
-                similar_item = self.find_similar_ingredient(name, existing_items)
-                
+            quantity = float(quantity)
+            with self._lock:
+                cursor = self.conn.cursor()
+                name_norm = self.normalize_ingredient_name(name)
+
+                # Sonde exacte via l'index unique : une recherche B-tree au
+                # lieu de rapatrier toute la liste dans Python
+                cursor.execute(_SQL_SELECT_EXACT, (name_norm,))
+                row = cursor.fetchone()
+                if row is not None:
+                    return self._update_existing_item(row, quantity, unit, recipe_source)
+
+                # Repli flou limité aux candidats plausibles : préfixe
+                # normalisé commun, plus les lignes héritées sans name_norm
+                cursor.execute(_SQL_SELECT_CANDIDATES, (name_norm,))
+
+                # Chercher un article similaire en itérant le curseur
+                # paresseusement : pas de fetchall ni de liste temporaire,
+                # et une correspondance exacte (ligne héritée sans
+                # name_norm) court-circuite le parcours
+                by_norm = {}
+                similar_item = None
+                for row in cursor:
+                    row_norm = self.normalize_ingredient_name(row['name'])
+                    if row_norm == name_norm:
+                        similar_item = row
+                        break
+                    by_norm.setdefault(row_norm, row)
+
+                if similar_item is None:
+                    similar_item = self._find_similar_in_index(name_norm, by_norm)
+
                 if similar_item:
                     # Mettre à jour l'article existant
                     return self._update_existing_item(similar_item, quantity, unit, recipe_source)
                 else:
                     # Créer un nouvel article
                     return self._create_new_item(name, quantity, unit, category, recipe_source)
-                    
+
         except Exception as e:
             print(f"Erreur add_or_update_item: {e}")
             return {'success': False, 'error': str(e)}
@@ -226,11 +455,12 @@ class AdvancedIngredientManager:
                             new_unit: str, recipe_source: str = None) -> Dict[str, Any]:
         """Met à jour un article existant en consolidant les quantités"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                existing_quantity = existing_item.get('quantity_decimal', existing_item.get('quantity', 1))
-                existing_unit = existing_item.get('unit', 'unité')
+            with self._lock:
+                cursor = self.conn.cursor()
+
+                # Les COALESCE de _ITEM_COLUMNS garantissent des valeurs
+                existing_quantity = existing_item['quantity_decimal']
+                existing_unit = existing_item['unit']
                 
                 # Essayer de convertir vers l'unité existante
                 converted_quantity = self.convert_units(new_quantity, new_unit, existing_unit)
@@ -254,9 +484,7 @@ class AdvancedIngredientManager:
                         f", {recipe_source}" if recipe_source else "",
                         existing_item['id']
                     ))
-                    
-                    conn.commit()
-                    
+
                     return {
                         'success': True,
                         'action': 'consolidated',
@@ -271,19 +499,13 @@ class AdvancedIngredientManager:
                 else:
                     # Conversion impossible, créer une note
                     note = f" (+ {new_quantity} {new_unit})"
-                    cursor.execute('''
-                        UPDATE shopping_list 
-                        SET name = CASE 
-                            WHEN name LIKE '%+%' THEN name || ', {new_quantity} {new_unit}'
-                            ELSE name || ?
-                        END,
-                        recipe_sources = COALESCE(recipe_sources, '') || ?,
-                        updated_at = CURRENT_TIMESTAMP
-                        WHERE id = ?
-                    ''', (note, f", {recipe_source}" if recipe_source else "", existing_item['id']))
-                    
-                    conn.commit()
-                    
+                    cursor.execute(_SQL_APPEND_NOTE, (
+                        f", {new_quantity} {new_unit}",
+                        note,
+                        f", {recipe_source}" if recipe_source else "",
+                        existing_item['id']
+                    ))
+
                     return {
                         'success': True,
                         'action': 'noted',
@@ -294,22 +516,22 @@ class AdvancedIngredientManager:
         except Exception as e:
             return {'success': False, 'error': str(e)}
     
-    def _create_new_item(self, name: str, quantity: float, unit: str, 
+    def _create_new_item(self, name: str, quantity: float, unit: str,
                         category: str, recipe_source: str = None) -> Dict[str, Any]:
         """Crée un nouvel article"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
+            with self._lock:
+                cursor = self.conn.cursor()
+
                 # Optimiser l'affichage de la quantité
                 display_quantity, display_unit = self.get_best_unit(quantity, unit)
-                
-                cursor.execute('''
-                    INSERT INTO shopping_list 
-                    (name, category, quantity, quantity_decimal, unit, recipe_sources, checked, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, 0, CURRENT_TIMESTAMP)
-                ''', (
+
+                # Upsert : si un article actif avec le même nom normalisé a
+                # été créé entre-temps, l'index unique déclenche le cumul au
+                # lieu d'une IntegrityError
+                cursor.execute(_SQL_INSERT_ITEM, (
                     name,
+                    self.normalize_ingredient_name(name),
                     category,
                     int(display_quantity) if display_quantity.is_integer() else display_quantity,
                     display_quantity,
@@ -318,8 +540,7 @@ class AdvancedIngredientManager:
                 ))
                 
                 item_id = cursor.lastrowid
-                conn.commit()
-                
+
                 return {
                     'success': True,
                     'action': 'created',
@@ -334,76 +555,229 @@ class AdvancedIngredientManager:
             return {'success': False, 'error': str(e)}
     
     def add_recipe_ingredients(self, recipe: Dict[str, Any]) -> Dict[str, Any]:
-        """Ajoute tous les ingrédients d'une recette avec consolidation"""
+        """Ajoute tous les ingrédients d'une recette avec consolidation
+
+        Toute la recette passe par une seule connexion et une seule
+        transaction : la liste existante n'est lue qu'une fois, les
+        consolidations et notes sont soumises en executemany, et un seul
+        commit clôt le lot (au lieu d'une transaction par ingrédient).
+        """
+        ingredients = recipe.get('ingredients', [])
+        recipe_source = recipe.get('name', 'Recette')
         results = {
             'success': True,
             'recipe_name': recipe.get('name', 'Recette sans nom'),
-            'total_ingredients': len(recipe.get('ingredients', [])),
+            'total_ingredients': len(ingredients),
             'actions': [],
             'consolidated_count': 0,
             'created_count': 0,
             'errors': []
         }
-        
-        for ingredient in recipe.get('ingredients', []):
+
+        with self._lock:
+            conn = self.conn
+            cursor = conn.cursor()
+            cursor.execute('BEGIN')
             try:
-                result = self.add_or_update_item(
-                    name=ingredient.get('name', ''),
-                    quantity=ingredient.get('quantity', 1),
-                    unit=ingredient.get('unit', 'unité'),
-                    category='Recettes',
-                    recipe_source=recipe.get('name', 'Recette')
-                )
-                
-                if result['success']:
-                    results['actions'].append(result)
-                    if result['action'] == 'consolidated':
-                        results['consolidated_count'] += 1
-                    elif result['action'] == 'created':
-                        results['created_count'] += 1
-                else:
-                    results['errors'].append(result.get('error', 'Erreur inconnue'))
-                    
+
+                # Indexer la liste existante une seule fois pour tout le
+                # lot : K recherches amorties sur N normalisations, au lieu
+                # de renormaliser le panier à chaque ingrédient
+                cursor.execute(_SQL_SELECT_UNCHECKED)
+                norm_index = {}
+                for row in cursor.fetchall():
+                    item = dict(row)
+                    norm_index.setdefault(self.normalize_ingredient_name(item['name']), item)
+
+                # Phase de planification : aucune écriture, on classe chaque
+                # ingrédient en création / consolidation / note
+                creates = []        # lignes pour l'executemany d'INSERT
+                created_refs = []   # (norm_name, item, action) à résoudre
+                consolidations = {}
+                notes = []
+                deferred_ids = []   # actions visant un article créé dans ce lot
+
+                for ingredient in ingredients:
+                    try:
+                        name = ingredient.get('name', '')
+                        quantity = float(ingredient.get('quantity', 1))
+                        unit = ingredient.get('unit', 'unité')
+                        source_suffix = f", {recipe_source}" if recipe_source else ""
+
+                        norm_name = self.normalize_ingredient_name(name)
+                        similar_item = self._find_similar_in_index(norm_name, norm_index)
+
+                        if similar_item is None:
+                            # Création planifiée ; l'id est résolu après le
+                            # executemany d'exécution
+                            display_quantity, display_unit = self.get_best_unit(quantity, unit)
+                            new_item = {
+                                'id': None,
+                                'name': name,
+                                'quantity': display_quantity,
+                                'quantity_decimal': display_quantity,
+                                'unit': display_unit,
+                                'recipe_sources': recipe_source or ""
+                            }
+                            action = {
+                                'success': True,
+                                'action': 'created',
+                                'item_id': None,
+                                'item_name': name,
+                                'quantity': display_quantity,
+                                'unit': display_unit,
+                                'message': f"Créé: {name} ({display_quantity} {display_unit})"
+                            }
+                            creates.append((
+                                name,
+                                norm_name,
+                                'Recettes',
+                                int(display_quantity) if display_quantity.is_integer() else display_quantity,
+                                display_quantity,
+                                display_unit,
+                                recipe_source or ""
+                            ))
+                            created_refs.append((norm_name, new_item, action))
+                            norm_index.setdefault(norm_name, new_item)
+                            results['actions'].append(action)
+                            results['created_count'] += 1
+                            continue
+
+                        existing_quantity = similar_item['quantity_decimal']
+                        existing_unit = similar_item['unit']
+                        converted_quantity = self.convert_units(quantity, unit, existing_unit)
+
+                        if converted_quantity is not None:
+                            # Consolidation : cumul en mémoire, écriture différée
+                            total_quantity = existing_quantity + converted_quantity
+                            final_quantity, final_unit = self.get_best_unit(total_quantity, existing_unit)
+
+                            similar_item['quantity_decimal'] = final_quantity
+                            similar_item['unit'] = final_unit
+                            # Indexé sur l'objet : les articles créés dans ce
+                            # lot n'ont pas encore d'id en base
+                            pending = consolidations.setdefault(id(similar_item),
+                                                                {'item': similar_item, 'suffix': ''})
+                            pending['quantity'] = final_quantity
+                            pending['unit'] = final_unit
+                            pending['suffix'] += source_suffix
+
+                            action = {
+                                'success': True,
+                                'action': 'consolidated',
+                                'item_id': similar_item['id'],
+                                'item_name': similar_item['name'],
+                                'old_quantity': existing_quantity,
+                                'old_unit': existing_unit,
+                                'new_quantity': final_quantity,
+                                'new_unit': final_unit,
+                                'message': f"Consolidé: {existing_quantity} {existing_unit} + {quantity} {unit} = {final_quantity} {final_unit}"
+                            }
+                            if similar_item['id'] is None:
+                                deferred_ids.append((similar_item, action))
+                            results['actions'].append(action)
+                            results['consolidated_count'] += 1
+                        else:
+                            # Conversion impossible, créer une note
+                            note = f" (+ {quantity} {unit})"
+                            notes.append((f", {quantity} {unit}", note,
+                                          source_suffix, similar_item))
+                            action = {
+                                'success': True,
+                                'action': 'noted',
+                                'item_id': similar_item['id'],
+                                'message': f"Ajouté en note: {similar_item['name']}{note}"
+                            }
+                            if similar_item['id'] is None:
+                                deferred_ids.append((similar_item, action))
+                            results['actions'].append(action)
+
+                    except Exception as e:
+                        results['errors'].append(str(e))
+
+                # Phase d'exécution : un executemany par type d'écriture.
+                # Les créations partent d'abord, puis leurs ids sont relus
+                # pour renseigner les actions et cibler les mises à jour
+                if creates:
+                    # Un seul INSERT ... SELECT FROM json_each pour tout le
+                    # lot ; retombe sur executemany si ce SQLite est
+                    # compilé sans JSON1
+                    payload = json.dumps([
+                        {'name': c[0], 'norm': c[1], 'qty_int': c[3],
+                         'qty': c[4], 'unit': c[5], 'src': c[6]}
+                        for c in creates
+                    ])
+                    try:
+                        cursor.execute(_SQL_INSERT_FROM_JSON, (payload,))
+                    except sqlite3.OperationalError:
+                        cursor.executemany(_SQL_INSERT_ITEM, creates)
+                    placeholders = ', '.join('?' * len(created_refs))
+                    id_by_norm = dict(cursor.execute(f'''
+                        SELECT name_norm, id FROM shopping_list
+                        WHERE checked = 0 AND name_norm IN ({placeholders})
+                    ''', [ref[0] for ref in created_refs]).fetchall())
+                    for created_norm, item, action in created_refs:
+                        item['id'] = id_by_norm.get(created_norm)
+                        action['item_id'] = item['id']
+                    for item, action in deferred_ids:
+                        action['item_id'] = item['id']
+
+                if consolidations:
+                    cursor.executemany(_SQL_CONSOLIDATE, [
+                        (
+                            int(p['quantity']) if p['quantity'].is_integer() else p['quantity'],
+                            p['quantity'],
+                            p['unit'],
+                            p['suffix'],
+                            p['item']['id']
+                        )
+                        for p in consolidations.values()
+                    ])
+
+                if notes:
+                    cursor.executemany(_SQL_APPEND_NOTE, [
+                        (fragment, note, suffix, item['id'])
+                        for fragment, note, suffix, item in notes
+                    ])
+
+                conn.commit()
+
             except Exception as e:
+                conn.rollback()
                 results['errors'].append(str(e))
-        
+
         if results['errors']:
-            results['success'] = len(results['errors']) < len(recipe.get('ingredients', []))
-        
+            results['success'] = len(results['errors']) < len(ingredients)
+
         return results
     
     def update_item_quantity(self, item_id: int, new_quantity: float, new_unit: str = None) -> Dict[str, Any]:
         """Met à jour la quantité d'un article existant"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Récupérer l'article actuel
-                cursor.execute('SELECT * FROM shopping_list WHERE id = ?', (item_id,))
+            with self._lock:
+                cursor = self.conn.cursor()
+
+                # Récupérer l'article actuel (projection explicite : plus
+                # d'indexation positionnelle fragile sur la ligne)
+                cursor.execute(_SQL_SELECT_ITEM_UNIT, (item_id,))
                 item = cursor.fetchone()
-                
+
                 if not item:
                     return {'success': False, 'error': 'Article non trouvé'}
-                
+
                 # Utiliser l'unité existante si pas spécifiée
-                unit = new_unit or item[5] if len(item) > 5 else 'unité'  # Assuming unit is at index 5
+                unit = new_unit or item['unit']
                 
                 # Optimiser l'affichage
                 display_quantity, display_unit = self.get_best_unit(new_quantity, unit)
                 
-                cursor.execute('''
-                    UPDATE shopping_list 
-                    SET quantity = ?, quantity_decimal = ?, unit = ?, updated_at = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                ''', (
+                cursor.execute(_SQL_UPDATE_QTY, (
                     int(display_quantity) if display_quantity.is_integer() else display_quantity,
                     display_quantity,
                     display_unit,
                     item_id
                 ))
-                
-                conn.commit()
-                
+
                 return {
                     'success': True,
                     'item_id': item_id,
@@ -418,15 +792,21 @@ class AdvancedIngredientManager:
 def upgrade_database_schema(db_path: str):
     """Met à jour le schéma de la base de données pour supporter les nouvelles fonctionnalités"""
     try:
-        with sqlite3.connect(db_path) as conn:
+        with contextlib.closing(sqlite3.connect(db_path, isolation_level=None)) as conn:
             cursor = conn.cursor()
-            
+
+            # Toute la migration (ALTER, backfill, index) dans une seule
+            # transaction : un verrou d'écriture pris d'emblée et un seul
+            # fsync au commit, au lieu d'un par instruction
+            cursor.execute('BEGIN IMMEDIATE')
+
             # Ajouter les nouvelles colonnes si elles n'existent pas
             new_columns = [
                 ('quantity_decimal', 'REAL'),
                 ('unit', 'TEXT DEFAULT "unité"'),
                 ('recipe_sources', 'TEXT'),
-                ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP')
+                ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+                ('name_norm', 'TEXT')
             ]
             
             # Vérifier les colonnes existantes
@@ -446,7 +826,50 @@ def upgrade_database_schema(db_path: str):
                     updated_at = COALESCE(updated_at, created_at, CURRENT_TIMESTAMP)
                 WHERE quantity_decimal IS NULL
             ''')
-            
+
+            # Remplir name_norm avec la vraie normalisation Python
+            conn.create_function('norm', 1, _normalize_name, deterministic=True)
+            cursor.execute('''
+                UPDATE shopping_list
+                SET name_norm = norm(name)
+                WHERE name_norm IS NULL
+            ''')
+
+            # Index unique partiel : garantit un seul article actif par nom
+            # normalisé et permet l'upsert ON CONFLICT(name_norm)
+            unique_index_sql = '''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_shopping_name_norm
+                ON shopping_list(name_norm)
+                WHERE checked = 0 AND name_norm IS NOT NULL
+            '''
+            try:
+                cursor.execute(unique_index_sql)
+            except sqlite3.IntegrityError:
+                # Doublons actifs hérités : cumuler sur la ligne la plus
+                # ancienne, supprimer les autres, puis recréer l'index
+                cursor.execute('''
+                    UPDATE shopping_list SET quantity_decimal = (
+                        SELECT SUM(COALESCE(s2.quantity_decimal, s2.quantity, 1))
+                        FROM shopping_list s2
+                        WHERE s2.checked = 0 AND s2.name_norm = shopping_list.name_norm
+                    )
+                    WHERE checked = 0 AND name_norm IS NOT NULL AND id IN (
+                        SELECT MIN(id) FROM shopping_list
+                        WHERE checked = 0 AND name_norm IS NOT NULL
+                        GROUP BY name_norm HAVING COUNT(*) > 1
+                    )
+                ''')
+                cursor.execute('''
+                    DELETE FROM shopping_list
+                    WHERE checked = 0 AND name_norm IS NOT NULL AND id NOT IN (
+                        SELECT MIN(id) FROM shopping_list
+                        WHERE checked = 0 AND name_norm IS NOT NULL
+                        GROUP BY name_norm
+                    )
+                ''')
+                cursor.execute(unique_index_sql)
+                print("✅ Doublons actifs consolidés avant création de l'index unique")
+
             # Créer des index pour améliorer les performances
             indexes = [
                 'CREATE INDEX IF NOT EXISTS idx_shopping_name_normalized ON shopping_list(LOWER(name))',
@@ -465,6 +888,11 @@ def upgrade_database_schema(db_path: str):
         print(f"❌ Erreur mise à jour schéma: {e}")
 
 # Instance globale
+@lru_cache(maxsize=8)
 def get_ingredient_manager(db_path: str) -> AdvancedIngredientManager:
-    """Retourne une instance du gestionnaire d'ingrédients"""
+    """Retourne le gestionnaire d'ingrédients (une instance par base)
+
+    Mémoïsé pour réutiliser la même instance — donc la même connexion
+    SQLite et les mêmes caches — d'un appel à l'autre.
+    """
     return AdvancedIngredientManager(db_path)
@@ -6,11 +6,15 @@ Utilise html.parser natif Python + html5lib comme fallback
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import re
 import logging
+import threading
 import time
 import random
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Any, Optional
 from urllib.parse import urljoin, quote
 
@@ -30,6 +34,17 @@ except ImportError:
     UA_AVAILABLE = False
     print("⚠️  fake_useragent non disponible, utilisation d'un user agent fixe")
 
+# selectolax (moteur Lexbor en C) : parse HTML sans allouer un objet Python
+# par nœud, ~4-6x plus rapide que BeautifulSoup sur les pages volumineuses.
+# Optionnel et hors requirements (même politique que lxml sur Raspberry Pi) :
+# utilisé seulement s'il est déjà installé, sinon BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+    print("✅ selectolax disponible (parser Lexbor)")
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 # User Agent de fallback si fake_useragent ne fonctionne pas
@@ -68,6 +83,33 @@ def safe_beautifulsoup(content, preferred_parser='html.parser'):
         logger.error(f"Tous les parsers BeautifulSoup ont échoué: {e}")
         return None
 
+class _RateLimiter:
+    """Limiteur de débit thread-safe (seau à jetons sur fenêtre glissante)
+
+    Préserve la politesse des anciens time.sleep aléatoires - même débit
+    moyen vers le site - tout en laissant les téléchargements parallèles
+    se recouvrir au lieu de se sérialiser.
+    """
+
+    def __init__(self, max_calls: int, period: float):
+        self._lock = threading.Lock()
+        self._calls = deque()
+        self._max_calls = max_calls
+        self._period = period
+
+    def acquire(self):
+        """Bloque jusqu'à ce qu'un créneau soit disponible dans la fenêtre"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] > self._period:
+                    self._calls.popleft()
+                if len(self._calls) < self._max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self._period - (now - self._calls[0])
+            time.sleep(max(wait, 0.05))
+
 class RealJowScraper:
     """Scraper réel pour jow.fr - VERSION SANS LXML"""
     
@@ -97,13 +139,23 @@ class RealJowScraper:
         })
         
         self.delay_range = (1, 3)  # Délai entre requêtes
-    
+
+        # Pool de connexions dimensionné pour les téléchargements parallèles
+        # de pages de détail (TCP/TLS réutilisés entre threads)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Même débit moyen que les anciens délais aléatoires, mais les
+        # requêtes parallèles peuvent se recouvrir dans la fenêtre
+        self._rate_limiter = _RateLimiter(max_calls=3, period=3 * sum(self.delay_range) / 2)
+
     def search_recipes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche réelle sur jow.fr avec fallback robuste"""
         try:
             logger.info(f"🔍 Recherche Jow réelle pour: '{query}'")
-            
-            if not BS4_AVAILABLE:
+
+            if not BS4_AVAILABLE and not SELECTOLAX_AVAILABLE:
                 return self._fallback_jow_recipes(query, limit)
             
             # URL de recherche Jow
@@ -114,20 +166,24 @@ class RealJowScraper:
             }
             
             # Respecter les délais
-            time.sleep(random.uniform(*self.delay_range))
-            
+            self._rate_limiter.acquire()
+
             response = self.session.get(search_url, params=params, timeout=10)
             response.raise_for_status()
-            
-            # Parser avec notre fonction sécurisée
-            soup = safe_beautifulsoup(response.content, 'html.parser')
-            
-            if soup is None:
-                logger.warning("Échec parsing HTML Jow, utilisation du fallback")
-                return self._fallback_jow_recipes(query, limit)
-            
-            # Parser les recettes depuis le HTML
-            recipes = self._parse_jow_recipes_html(soup, limit)
+
+            if SELECTOLAX_AVAILABLE:
+                # Parser Lexbor en C, sans arbre d'objets Python
+                recipes = self._parse_jow_recipes_html_lexbor(response.content, limit)
+            else:
+                # Parser avec notre fonction sécurisée
+                soup = safe_beautifulsoup(response.content, 'html.parser')
+
+                if soup is None:
+                    logger.warning("Échec parsing HTML Jow, utilisation du fallback")
+                    return self._fallback_jow_recipes(query, limit)
+
+                # Parser les recettes depuis le HTML
+                recipes = self._parse_jow_recipes_html(soup, limit)
             
             logger.info(f"✅ Trouvé {len(recipes)} recettes Jow pour '{query}'")
             return recipes
@@ -164,18 +220,183 @@ class RealJowScraper:
             except:
                 continue
         
+        # Télécharger les pages de détail en parallèle avant l'assemblage
+        prefetched = self._fetch_ingredients_parallel(
+            [self._card_url(card) for card in recipe_cards]
+        )
+
         for i, card in enumerate(recipe_cards):
             try:
-                recipe = self._extract_recipe_from_card(card, f"jow_real_{i}")
+                recipe = self._extract_recipe_from_card(card, f"jow_real_{i}", prefetched)
                 if recipe:
                     recipes.append(recipe)
             except Exception as e:
                 logger.warning(f"Erreur parsing recette Jow: {e}")
                 continue
-        
+
         return recipes
-    
-    def _extract_recipe_from_card(self, card, recipe_id: str) -> Dict[str, Any]:
+
+    def _card_url(self, card) -> Optional[str]:
+        """URL de détail d'une carte BeautifulSoup (None si absente)"""
+        try:
+            link_elem = card.select_one('a')
+            if link_elem:
+                href = link_elem.get('href')
+                if href:
+                    return urljoin(self.base_url, href)
+        except:
+            pass
+        return None
+
+    def _card_url_lexbor(self, card) -> Optional[str]:
+        """URL de détail d'une carte Lexbor (None si absente)"""
+        link_elem = card.css_first('a')
+        if link_elem:
+            href = link_elem.attributes.get('href')
+            if href:
+                return urljoin(self.base_url, href)
+        return None
+
+    def _fetch_ingredients_parallel(self, urls: List[Optional[str]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Récupère les ingrédients de plusieurs pages de détail en parallèle
+
+        Le travail est 100% I/O : sur la session poolée, la latence totale
+        tend vers celle de la page la plus lente au lieu de la somme des
+        RTT + délais de politesse (le limiteur de débit reste respecté).
+        """
+        unique_urls = [u for u in dict.fromkeys(urls) if u]
+        if not unique_urls:
+            return {}
+
+        def fetch(url):
+            try:
+                return self._get_recipe_ingredients(url)
+            except Exception as e:
+                logger.warning(f"Erreur récupération ingrédients: {e}")
+                return []
+
+        with ThreadPoolExecutor(max_workers=min(6, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(fetch, unique_urls)))
+
+    def _parse_jow_recipes_html_lexbor(self, content: bytes, limit: int) -> List[Dict[str, Any]]:
+        """Parse les recettes Jow via selectolax (moteur Lexbor en C)
+
+        Même contrat de sortie que _parse_jow_recipes_html.
+        """
+        recipes = []
+        tree = LexborHTMLParser(content)
+
+        # Mêmes sélecteurs que le chemin BeautifulSoup
+        selectors = [
+            'div[class*="recipe"]',
+            'div[class*="Recipe"]',
+            'article[class*="recipe"]',
+            '.recipe-card',
+            '.RecipeCard',
+            '.recipe-item'
+        ]
+
+        recipe_cards = []
+        for selector in selectors:
+            try:
+                cards = tree.css(selector)
+                if cards:
+                    recipe_cards = cards[:limit]
+                    break
+            except:
+                continue
+
+        # Télécharger les pages de détail en parallèle avant l'assemblage
+        prefetched = self._fetch_ingredients_parallel(
+            [self._card_url_lexbor(card) for card in recipe_cards]
+        )
+
+        for i, card in enumerate(recipe_cards):
+            try:
+                recipe = self._extract_recipe_from_card_lexbor(card, f"jow_real_{i}", prefetched)
+                if recipe:
+                    recipes.append(recipe)
+            except Exception as e:
+                logger.warning(f"Erreur parsing recette Jow: {e}")
+                continue
+
+        return recipes
+
+    def _extract_recipe_from_card_lexbor(self, card, recipe_id: str,
+                                         prefetched: Optional[Dict[str, List]] = None) -> Optional[Dict[str, Any]]:
+        """Extrait une recette depuis un nœud Lexbor (équivalent C de
+        _extract_recipe_from_card, même contrat de sortie)"""
+        try:
+            # Nom de la recette - plusieurs sélecteurs possibles
+            name = None
+            for selector in ['h2', 'h3', 'h4', '[class*="title"]', '[class*="name"]']:
+                name_elem = card.css_first(selector)
+                if name_elem:
+                    name = name_elem.text(strip=True)
+                    if name:
+                        break
+
+            if not name:
+                name = "Recette Jow"
+
+            card_text = card.text()
+
+            # Temps de préparation
+            prep_time = 30
+            time_match = re.search(r'(\d+)\s*min', card_text)
+            if time_match:
+                prep_time = int(time_match.group(1))
+
+            # Portions
+            servings = 4
+            serving_match = re.search(r'(\d+)\s*pers', card_text)
+            if serving_match:
+                servings = int(serving_match.group(1))
+
+            # Image
+            image_url = None
+            img_elem = card.css_first('img')
+            if img_elem:
+                image_url = img_elem.attributes.get('src') or img_elem.attributes.get('data-src')
+
+            # URL de la recette pour récupérer les ingrédients
+            recipe_url = self._card_url_lexbor(card)
+
+            # Ingrédients : pré-téléchargés en parallèle si fournis, sinon
+            # récupérés à la demande (avec gestion d'erreur)
+            ingredients = []
+            if recipe_url:
+                if prefetched is not None and recipe_url in prefetched:
+                    ingredients = prefetched[recipe_url]
+                else:
+                    try:
+                        ingredients = self._get_recipe_ingredients(recipe_url)
+                    except:
+                        pass
+
+            # Si pas d'ingrédients, créer des ingrédients de base
+            if not ingredients:
+                ingredients = self._generate_basic_ingredients(name)
+
+            return {
+                'id': recipe_id,
+                'name': name,
+                'servings': servings,
+                'prepTime': prep_time,
+                'difficulty': 'Moyen',
+                'image': image_url,
+                'ingredients': ingredients,
+                'source': 'jow',
+                'url': recipe_url,
+                'tags': ['jow', 'scraping']
+            }
+
+        except Exception as e:
+            logger.warning(f"Erreur extraction recette: {e}")
+            return None
+
+    def _extract_recipe_from_card(self, card, recipe_id: str,
+                                  prefetched: Optional[Dict[str, List]] = None) -> Dict[str, Any]:
         """Extrait les données d'une recette depuis une carte HTML de manière robuste"""
         try:
             # Nom de la recette - plusieurs sélecteurs possibles
@@ -223,23 +444,19 @@ class RealJowScraper:
                 pass
             
             # URL de la recette pour récupérer les ingrédients
-            recipe_url = None
-            try:
-                link_elem = card.select_one('a')
-                if link_elem:
-                    href = link_elem.get('href')
-                    if href:
-                        recipe_url = urljoin(self.base_url, href)
-            except:
-                pass
-            
-            # Récupérer les ingrédients depuis la page de détail (avec gestion d'erreur)
+            recipe_url = self._card_url(card)
+
+            # Ingrédients : pré-téléchargés en parallèle si fournis, sinon
+            # récupérés à la demande (avec gestion d'erreur)
             ingredients = []
             if recipe_url:
-                try:
-                    ingredients = self._get_recipe_ingredients(recipe_url)
-                except:
-                    pass
+                if prefetched is not None and recipe_url in prefetched:
+                    ingredients = prefetched[recipe_url]
+                else:
+                    try:
+                        ingredients = self._get_recipe_ingredients(recipe_url)
+                    except:
+                        pass
             
             # Si pas d'ingrédients, créer des ingrédients de base
             if not ingredients:
@@ -265,10 +482,13 @@ class RealJowScraper:
     def _get_recipe_ingredients(self, recipe_url: str) -> List[Dict[str, Any]]:
         """Récupère les ingrédients depuis la page de détail de manière robuste"""
         try:
-            time.sleep(random.uniform(*self.delay_range))
+            self._rate_limiter.acquire()
             response = self.session.get(recipe_url, timeout=10)
             response.raise_for_status()
-            
+
+            if SELECTOLAX_AVAILABLE:
+                return self._extract_ingredients_lexbor(response.content)
+
             soup = safe_beautifulsoup(response.content, 'html.parser')
             if soup is None:
                 return []
@@ -329,6 +549,39 @@ class RealJowScraper:
             logger.warning(f"Erreur récupération ingrédients: {e}")
             return []
     
+    def _extract_ingredients_lexbor(self, content: bytes) -> List[Dict[str, Any]]:
+        """Extrait les ingrédients d'une page de détail via Lexbor
+        (mêmes sélecteurs et même contrat que le chemin BeautifulSoup)"""
+        tree = LexborHTMLParser(content)
+        ingredients = []
+
+        ingredient_selectors = [
+            'ul[class*="ingredient"] li',
+            'ol[class*="ingredient"] li',
+            '.ingredients li',
+            '.ingredient-list li',
+            '[class*="ingredient"] li',
+            'div[class*="ingredient"]',
+            '.ingredient-item',
+            '[data-ingredient]'
+        ]
+
+        for selector in ingredient_selectors:
+            try:
+                for item in tree.css(selector):
+                    text = item.text(strip=True)
+                    if text and len(text) > 2:
+                        parsed = self._parse_ingredient_text(text)
+                        if parsed:
+                            ingredients.append(parsed)
+
+                if ingredients:
+                    break
+            except:
+                continue
+
+        return ingredients[:20]  # Limiter à 20 ingrédients max
+
     def _parse_ingredient_text(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse le texte d'un ingrédient pour extraire quantité, unité et nom"""
         if not text or len(text.strip()) < 2:
@@ -559,13 +812,21 @@ class RealMarmitonScraper:
         })
         
         self.delay_range = (2, 4)  # Délai plus long pour Marmiton
-    
+
+        # Pool de connexions dimensionné pour les téléchargements parallèles
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # Même débit moyen que les anciens délais aléatoires
+        self._rate_limiter = _RateLimiter(max_calls=3, period=3 * sum(self.delay_range) / 2)
+
     def search_recipes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Recherche réelle sur marmiton.org avec fallback robuste"""
         try:
             logger.info(f"🔍 Recherche Marmiton réelle pour: '{query}'")
-            
-            if not BS4_AVAILABLE:
+
+            if not BS4_AVAILABLE and not SELECTOLAX_AVAILABLE:
                 return self._fallback_marmiton_recipes(query, limit)
             
             # URL de recherche Marmiton
@@ -574,19 +835,23 @@ class RealMarmitonScraper:
                 'aqt': query
             }
             
-            time.sleep(random.uniform(*self.delay_range))
-            
+            self._rate_limiter.acquire()
+
             response = self.session.get(search_url, params=params, timeout=15)
             response.raise_for_status()
-            
-            soup = safe_beautifulsoup(response.content, 'html.parser')
-            
-            if soup is None:
-                logger.warning("Échec parsing HTML Marmiton, utilisation du fallback")
-                return self._fallback_marmiton_recipes(query, limit)
-            
-            # Parser les résultats de recherche
-            recipes = self._parse_marmiton_search_results(soup, limit)
+
+            if SELECTOLAX_AVAILABLE:
+                # Parser Lexbor en C, sans arbre d'objets Python
+                recipes = self._parse_marmiton_search_results_lexbor(response.content, limit)
+            else:
+                soup = safe_beautifulsoup(response.content, 'html.parser')
+
+                if soup is None:
+                    logger.warning("Échec parsing HTML Marmiton, utilisation du fallback")
+                    return self._fallback_marmiton_recipes(query, limit)
+
+                # Parser les résultats de recherche
+                recipes = self._parse_marmiton_search_results(soup, limit)
             
             logger.info(f"✅ Trouvé {len(recipes)} recettes Marmiton pour '{query}'")
             return recipes
@@ -621,18 +886,164 @@ class RealMarmitonScraper:
             except:
                 continue
         
+        # Télécharger les pages de détail en parallèle avant l'assemblage
+        prefetched = self._fetch_details_parallel(
+            [self._card_url(card) for card in recipe_cards]
+        )
+
         for i, card in enumerate(recipe_cards):
             try:
-                recipe = self._extract_marmiton_recipe(card, f"marmiton_real_{i}")
+                recipe = self._extract_marmiton_recipe(card, f"marmiton_real_{i}", prefetched)
                 if recipe:
                     recipes.append(recipe)
             except Exception as e:
                 logger.warning(f"Erreur parsing recette Marmiton: {e}")
                 continue
-        
+
         return recipes
-    
-    def _extract_marmiton_recipe(self, card, recipe_id: str) -> Optional[Dict[str, Any]]:
+
+    def _card_url(self, card) -> Optional[str]:
+        """URL de détail d'une carte BeautifulSoup (None si absente)"""
+        try:
+            link_elem = card.select_one('a')
+            if link_elem:
+                href = link_elem.get('href')
+                if href:
+                    return urljoin(self.base_url, href)
+        except:
+            pass
+        return None
+
+    def _card_url_lexbor(self, card) -> Optional[str]:
+        """URL de détail d'une carte Lexbor (None si absente)"""
+        link_elem = card.css_first('a')
+        if link_elem:
+            href = link_elem.attributes.get('href')
+            if href:
+                return urljoin(self.base_url, href)
+        return None
+
+    def _fetch_details_parallel(self, urls: List[Optional[str]]) -> Dict[str, Dict[str, Any]]:
+        """Récupère les détails de plusieurs recettes en parallèle sur la
+        session poolée (le limiteur de débit reste respecté)"""
+        unique_urls = [u for u in dict.fromkeys(urls) if u]
+        if not unique_urls:
+            return {}
+
+        def fetch(url):
+            try:
+                return self._get_marmiton_recipe_details(url)
+            except Exception as e:
+                logger.warning(f"Erreur détails recette Marmiton: {e}")
+                return {}
+
+        with ThreadPoolExecutor(max_workers=min(6, len(unique_urls))) as executor:
+            return dict(zip(unique_urls, executor.map(fetch, unique_urls)))
+
+    def _parse_marmiton_search_results_lexbor(self, content: bytes, limit: int) -> List[Dict[str, Any]]:
+        """Parse les résultats Marmiton via selectolax (moteur Lexbor en C)
+
+        Même contrat de sortie que _parse_marmiton_search_results.
+        """
+        recipes = []
+        tree = LexborHTMLParser(content)
+
+        # Mêmes sélecteurs que le chemin BeautifulSoup
+        selectors = [
+            'div[class*="recipe"]',
+            'div[class*="Recipe"]',
+            'article[class*="recipe"]',
+            '.recipe-card',
+            'div[class*="MRTN"]'
+        ]
+
+        recipe_cards = []
+        for selector in selectors:
+            try:
+                cards = tree.css(selector)
+                if cards:
+                    recipe_cards = cards[:limit]
+                    break
+            except:
+                continue
+
+        # Télécharger les pages de détail en parallèle avant l'assemblage
+        prefetched = self._fetch_details_parallel(
+            [self._card_url_lexbor(card) for card in recipe_cards]
+        )
+
+        for i, card in enumerate(recipe_cards):
+            try:
+                recipe = self._extract_marmiton_recipe_lexbor(card, f"marmiton_real_{i}", prefetched)
+                if recipe:
+                    recipes.append(recipe)
+            except Exception as e:
+                logger.warning(f"Erreur parsing recette Marmiton: {e}")
+                continue
+
+        return recipes
+
+    def _extract_marmiton_recipe_lexbor(self, card, recipe_id: str,
+                                        prefetched: Optional[Dict[str, Dict]] = None) -> Optional[Dict[str, Any]]:
+        """Extrait une recette depuis un nœud Lexbor (équivalent C de
+        _extract_marmiton_recipe, même contrat de sortie)"""
+        try:
+            # Nom de la recette
+            name = None
+            for selector in ['h2', 'h3', 'a[class*="title"]', '[class*="recipe-title"]']:
+                name_elem = card.css_first(selector)
+                if name_elem:
+                    name = name_elem.text(strip=True)
+                    if name:
+                        break
+
+            if not name:
+                name = "Recette Marmiton"
+
+            # Lien vers la recette
+            recipe_url = self._card_url_lexbor(card)
+
+            # Détails : pré-téléchargés en parallèle si fournis, sinon
+            # récupérés à la demande (avec gestion d'erreur)
+            recipe_details = {}
+            if recipe_url:
+                if prefetched is not None and recipe_url in prefetched:
+                    recipe_details = prefetched[recipe_url]
+                else:
+                    try:
+                        recipe_details = self._get_marmiton_recipe_details(recipe_url)
+                    except:
+                        pass
+
+            # Si pas de détails, utiliser des valeurs par défaut
+            if not recipe_details:
+                recipe_details = {
+                    'ingredients': self._generate_basic_ingredients_marmiton(name),
+                    'prepTime': 30,
+                    'servings': 4,
+                    'image': None
+                }
+
+            return {
+                'id': recipe_id,
+                'name': name,
+                'servings': recipe_details.get('servings', 4),
+                'prepTime': recipe_details.get('prepTime', 30),
+                'difficulty': recipe_details.get('difficulty', 'Moyen'),
+                'image': recipe_details.get('image'),
+                'ingredients': recipe_details.get('ingredients', []),
+                'instructions': recipe_details.get('instructions', []),
+                'source': 'marmiton',
+                'url': recipe_url,
+                'tags': ['marmiton', 'scraping']
+            }
+
+        except Exception as e:
+            logger.warning(f"Erreur extraction recette Marmiton: {e}")
+            return None
+
+    def _extract_marmiton_recipe(self, card, recipe_id: str,
+                                 prefetched: Optional[Dict[str, Dict]] = None) -> Optional[Dict[str, Any]]:
         """Extrait une recette depuis une carte Marmiton de manière robuste"""
         try:
             # Nom de la recette
@@ -653,23 +1064,19 @@ class RealMarmitonScraper:
                 name = "Recette Marmiton"
             
             # Lien vers la recette
-            recipe_url = None
-            try:
-                link_elem = card.select_one('a')
-                if link_elem:
-                    href = link_elem.get('href')
-                    if href:
-                        recipe_url = urljoin(self.base_url, href)
-            except:
-                pass
-            
-            # Récupérer les détails depuis la page de la recette (avec gestion d'erreur)
+            recipe_url = self._card_url(card)
+
+            # Détails : pré-téléchargés en parallèle si fournis, sinon
+            # récupérés à la demande (avec gestion d'erreur)
             recipe_details = {}
             if recipe_url:
-                try:
-                    recipe_details = self._get_marmiton_recipe_details(recipe_url)
-                except:
-                    pass
+                if prefetched is not None and recipe_url in prefetched:
+                    recipe_details = prefetched[recipe_url]
+                else:
+                    try:
+                        recipe_details = self._get_marmiton_recipe_details(recipe_url)
+                    except:
+                        pass
             
             # Si pas de détails, utiliser des valeurs par défaut
             if not recipe_details:
@@ -709,12 +1116,15 @@ class RealMarmitonScraper:
     def _get_marmiton_recipe_details(self, recipe_url: str) -> Dict[str, Any]:
         """Récupère les détails d'une recette Marmiton de manière robuste"""
         try:
-            time.sleep(random.uniform(*self.delay_range))
+            self._rate_limiter.acquire()
             response = self.session.get(recipe_url, timeout=15)
             response.raise_for_status()
-            
+
+            if SELECTOLAX_AVAILABLE:
+                return self._extract_marmiton_details_lexbor(response.content)
+
             soup = safe_beautifulsoup(response.content, 'html.parser')
-            
+
             if soup is None:
                 return {}
             
@@ -773,10 +1183,81 @@ class RealMarmitonScraper:
             logger.warning(f"Erreur détails recette Marmiton: {e}")
             return {}
     
+    def _extract_marmiton_details_lexbor(self, content: bytes) -> Dict[str, Any]:
+        """Extrait les détails d'une recette Marmiton via Lexbor
+        (mêmes sélecteurs et même contrat que le chemin BeautifulSoup)"""
+        tree = LexborHTMLParser(content)
+        details = {}
+
+        # Ingrédients avec plusieurs sélecteurs
+        ingredients = []
+        ingredient_selectors = [
+            'ul[class*="ingredient"] li',
+            'div[class*="ingredient"]',
+            '.recipe-ingredients li',
+            '.mrtn__recipe_ingredients li'
+        ]
+
+        for selector in ingredient_selectors:
+            try:
+                for item in tree.css(selector):
+                    text = item.text(strip=True)
+                    if text and len(text) > 2:
+                        parsed = self._parse_marmiton_ingredient(text)
+                        if parsed:
+                            ingredients.append(parsed)
+
+                if ingredients:
+                    break
+            except:
+                continue
+
+        details['ingredients'] = ingredients[:15]  # Limiter à 15
+
+        body = tree.body
+        page_text = body.text() if body is not None else ''
+
+        # Temps de préparation
+        try:
+            time_elem = tree.css_first('[data-cooktime]')
+            if time_elem:
+                details['prepTime'] = self._extract_time(time_elem.text())
+            else:
+                time_match = re.search(r'(\d+)\s*min', page_text)
+                details['prepTime'] = int(time_match.group(1)) if time_match else 30
+        except:
+            details['prepTime'] = 30
+
+        # Portions
+        try:
+            serving_elem = tree.css_first('[data-serving]')
+            if serving_elem:
+                details['servings'] = self._extract_servings(serving_elem.text())
+            else:
+                serving_match = re.search(r'(\d+)\s*pers', page_text)
+                details['servings'] = int(serving_match.group(1)) if serving_match else 4
+        except:
+            details['servings'] = 4
+
+        # Image
+        try:
+            img_elem = tree.css_first('img[class*="recipe"], img[class*="media"]')
+            details['image'] = img_elem.attributes.get('src') if img_elem else None
+        except:
+            details['image'] = None
+
+        return details
+
+    # Parseur Jow partagé entre instances et threads : en créer un par
+    # ingrédient coûtait une Session + UserAgent à chaque appel
+    _jow_parser: Optional['RealJowScraper'] = None
+
     def _parse_marmiton_ingredient(self, text: str) -> Optional[Dict[str, Any]]:
         """Parse un ingrédient Marmiton de manière robuste"""
         # Réutiliser la logique de parsing de Jow
-        return RealJowScraper()._parse_ingredient_text(text)
+        if RealMarmitonScraper._jow_parser is None:
+            RealMarmitonScraper._jow_parser = RealJowScraper()
+        return RealMarmitonScraper._jow_parser._parse_ingredient_text(text)
     
     def _extract_time(self, element) -> int:
         """Extrait le temps depuis un élément"""
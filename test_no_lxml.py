@@ -124,6 +124,13 @@ def test_quantity_manager():
         # Test basique
         manager = get_ingredient_manager(":memory:")  # Base en mémoire pour test
         print("✅ Gestionnaire quantités importé")
+
+        # Cas limites de get_best_unit
+        assert manager.get_best_unit(999.9999, 'g') == (999.9999, 'g'), "999.9999 g doit rester en g"
+        assert manager.get_best_unit(1000.0, 'g') == (1.0, 'kg'), "1000 g doit passer en kg"
+        assert manager.get_best_unit(0.5, 'l') == (500.0, 'ml'), "0.5 l doit passer en ml"
+        assert manager.get_best_unit(1500, 'g') == (1.5, 'kg'), "une quantité entière (int) doit être acceptée"
+        print("✅ get_best_unit cas limites OK")
         return True
         
     except ImportError as e: